@@ -10,15 +10,30 @@ Nut 项目文件生成器
 __version__ = "1.0.0"
 __author__ = "Nut Team"
 
-from Tools.ProjectGenerator.core.project_info import ProjectInfo, ProjectType
-from Tools.ProjectGenerator.generators.xcode_generator import XCodeProjectGenerator
-from Tools.ProjectGenerator.generators.vcxproj_generator import VcxprojGenerator
-from Tools.ProjectGenerator.generators.workspace_generator import WorkspaceGenerator
-
 __all__ = [
     "ProjectInfo",
-    "ProjectType", 
+    "ProjectType",
     "XCodeProjectGenerator",
     "VcxprojGenerator",
     "WorkspaceGenerator"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    """PEP 562 惰性导入
+
+    按需导入各生成器模块，缩短只使用单个生成器时的 CLI 启动时间。
+    """
+    if name in ("ProjectInfo", "ProjectType"):
+        from Tools.ProjectGenerator.core import project_info
+        return getattr(project_info, name)
+    if name == "XCodeProjectGenerator":
+        from Tools.ProjectGenerator.generators.xcode_generator import XCodeProjectGenerator
+        return XCodeProjectGenerator
+    if name == "VcxprojGenerator":
+        from Tools.ProjectGenerator.generators.vcxproj_generator import VcxprojGenerator
+        return VcxprojGenerator
+    if name == "WorkspaceGenerator":
+        from Tools.ProjectGenerator.generators.workspace_generator import WorkspaceGenerator
+        return WorkspaceGenerator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
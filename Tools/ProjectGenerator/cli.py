@@ -7,15 +7,16 @@ Nut 项目文件生成器命令行接口
 
 import argparse
 import logging
+import operator
+import os
 import sys
 from pathlib import Path
 from typing import List
 
 from Tools.ProjectGenerator.core.project_discoverer import ProjectDiscoverer
-from Tools.ProjectGenerator.generators.xcode_generator import XCodeProjectGenerator
-from Tools.ProjectGenerator.generators.vcxproj_generator import VcxprojGenerator
-from Tools.ProjectGenerator.generators.workspace_generator import WorkspaceGenerator
-from Tools.ProjectGenerator.generators.clangd_generator import ClangdGenerator
+
+# 各生成器在对应命令的函数内按需导入：
+# 单一命令（如仅 xcode / discover / --help）不必加载全部生成器模块
 
 
 def SetupLogging(verbose: bool = False):
@@ -28,6 +29,16 @@ def SetupLogging(verbose: bool = False):
     )
 
 
+def RelativeToRoot(path: Path, project_root: Path) -> str:
+    """获取相对项目根目录的显示路径
+
+    路径均以 project_root 为前缀构建，直接做字符串前缀裁剪，
+    避免 Path.relative_to 逐段比较的开销。
+    """
+    root_prefix = str(project_root) + os.sep
+    return str(path).removeprefix(root_prefix)
+
+
 def DiscoverProjects(project_root: Path) -> List:
     """发现所有项目"""
     discoverer = ProjectDiscoverer(project_root)
@@ -37,72 +48,88 @@ def DiscoverProjects(project_root: Path) -> List:
         print("❌ 未发现任何项目")
         return []
     
-    # 按分组显示项目
-    print(f"📁 发现 {len(projects)} 个项目:")
+    # 按分组显示项目（批量拼接后一次性输出，避免逐行 flush）
+    lines = [f"📁 发现 {len(projects)} 个项目:"]
     current_group = None
-    
-    for project in sorted(projects, key=lambda p: (p.group_name, p.name)):
+
+    # attrgetter 在 C 层直接构造排序键元组，省去每次比较的 lambda 调用
+    for project in sorted(projects, key=operator.attrgetter('group_name', 'name')):
         if project.group_name != current_group:
-            print(f"  📂 {project.group_name}:")
+            lines.append(f"  📂 {project.group_name}:")
             current_group = project.group_name
-        
+
         project_type_icon = "⚙️" if project.is_csharp else "🔧"
-        print(f"    {project_type_icon} {project.name} ({project.project_type.value})")
-    
+        lines.append(f"    {project_type_icon} {project.name} ({project.project_type.value})")
+
+    print('\n'.join(lines))
     return projects
 
 
 def GenerateXcodeProjects(projects: List, project_root: Path):
     """生成 XCode 项目文件"""
+    from Tools.ProjectGenerator.generators.xcode_generator import XCodeProjectGenerator
+    from Tools.ProjectGenerator.generators.workspace_generator import WorkspaceGenerator
+
     print("\n🍎 生成 XCode 项目文件...")
-    
+
     generator = XCodeProjectGenerator(project_root)
-    generated_files = generator.GenerateProjects(projects)
+    generated_files = generator.GenerateAll(projects)
     
     # 生成工作空间
     workspace_generator = WorkspaceGenerator(project_root)
     workspace_path = workspace_generator.GenerateWorkspace(projects, "xcode")
     
-    print(f"\n✅ XCode 项目生成完成:")
+    lines = [f"\n✅ XCode 项目生成完成:"]
     for file_path in generated_files:
         if file_path:  # 跳过 None 值（C# 项目）
-            print(f"  📁 {file_path.relative_to(project_root)}")
-    
+            lines.append(f"  📁 {RelativeToRoot(file_path, project_root)}")
+
     if workspace_path:
-        print(f"  🗂️ {workspace_path.relative_to(project_root)}")
+        lines.append(f"  🗂️ {RelativeToRoot(workspace_path, project_root)}")
+
+    print('\n'.join(lines))
 
 
 def GenerateVsProjects(projects: List, project_root: Path):
     """生成 Visual Studio 项目文件"""
+    from Tools.ProjectGenerator.generators.vcxproj_generator import VcxprojGenerator
+    from Tools.ProjectGenerator.generators.workspace_generator import WorkspaceGenerator
+
     print("\n🔵 生成 Visual Studio 项目文件...")
-    
+
     generator = VcxprojGenerator(project_root)
-    generated_files = generator.GenerateProjects(projects)
+    generated_files = generator.GenerateAll(projects)
     
     # 生成解决方案
     workspace_generator = WorkspaceGenerator(project_root)
     solution_path = workspace_generator.GenerateWorkspace(projects, "vs")
     
-    print(f"\n✅ Visual Studio 项目生成完成:")
+    lines = [f"\n✅ Visual Studio 项目生成完成:"]
     for file_path in generated_files:
         if file_path:  # 跳过 None 值（C# 项目已有 .csproj）
-            print(f"  📁 {file_path.relative_to(project_root)}")
-    
+            lines.append(f"  📁 {RelativeToRoot(file_path, project_root)}")
+
     if solution_path:
-        print(f"  📄 {solution_path.relative_to(project_root)}")
+        lines.append(f"  📄 {RelativeToRoot(solution_path, project_root)}")
+
+    print('\n'.join(lines))
 
 
 def GenerateClangdConfigs(projects: List, project_root: Path):
     """生成 clangd 配置文件"""
+    from Tools.ProjectGenerator.generators.clangd_generator import ClangdGenerator
+
     print("\n🔧 生成 clangd 配置文件...")
-    
+
     generator = ClangdGenerator(project_root)
     generated_files = generator.GenerateClangdConfigs(projects)
     
-    print(f"\n✅ clangd 配置生成完成:")
+    lines = [f"\n✅ clangd 配置生成完成:"]
     for config_name, file_path in generated_files.items():
         if file_path:
-            print(f"  📄 {file_path.relative_to(project_root)}")
+            lines.append(f"  📄 {RelativeToRoot(file_path, project_root)}")
+
+    print('\n'.join(lines))
     
     if generated_files:
         print("\n💡 clangd 配置说明:")
@@ -8,12 +8,14 @@ from Tools.ProjectGenerator.core.project_info import ProjectInfo, ProjectType, F
 from Tools.ProjectGenerator.core.project_discoverer import ProjectDiscoverer
 from Tools.ProjectGenerator.core.metadata_parser import MetadataParser
 from Tools.ProjectGenerator.core.file_collector import FileCollector
+from Tools.ProjectGenerator.core.discovery_cache import ProjectDiscoveryCache
 
 __all__ = [
     "ProjectInfo",
-    "ProjectType", 
+    "ProjectType",
     "FileGroup",
     "ProjectDiscoverer",
     "MetadataParser",
-    "FileCollector"
+    "FileCollector",
+    "ProjectDiscoveryCache"
 ]
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""
+项目发现缓存
+
+将项目目录的分析结果（ProjectInfo）持纹化缓存到磁盘，
+用 mtime+size 指纹判断目录是否变化，未变化的项目直接复用缓存，
+省去重复的构建文件解析和文件收集。
+"""
+
+import logging
+import os
+import pickle
+from pathlib import Path
+from typing import Optional, Tuple
+
+from Tools.ProjectGenerator.core.project_info import ProjectInfo
+
+
+logger = logging.getLogger(__name__)
+
+
+# 缓存格式版本号，缓存结构变化时递增以废弃旧缓存
+CACHE_VERSION = "5"
+
+
+class ProjectDiscoveryCache:
+    """项目发现缓存"""
+
+    def __init__(self, project_root: Path):
+        """
+        初始化缓存
+
+        Args:
+            project_root: 项目根目录，缓存存放在其下的 .nutgen-cache/
+        """
+        self.cache_dir = project_root / ".nutgen-cache"
+        self.cache_path = self.cache_dir / "discovery.pkl"
+        self._entries = {}
+        self._dirty = False
+        self._Load()
+
+    def _Load(self):
+        """从磁盘加载缓存，版本不匹配或损坏时丢弃"""
+        try:
+            with open(self.cache_path, 'rb') as f:
+                payload = pickle.load(f)
+        except (OSError, EOFError, pickle.PickleError, AttributeError, ImportError):
+            return
+
+        if isinstance(payload, dict) and payload.get('version') == CACHE_VERSION:
+            self._entries = payload.get('entries', {})
+
+    def ComputeFingerprint(self, project_dir: Path) -> Tuple:
+        """
+        计算项目目录的指纹
+
+        递归收集目录下所有文件的 (路径, mtime_ns, size)，
+        只做 stat 不读内容，任何文件的增删改都会改变指纹。
+
+        Args:
+            project_dir: 项目目录
+
+        Returns:
+            可比较、可哈希的指纹元组
+        """
+        records = []
+        stack = [str(project_dir)]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            stat = entry.stat()
+                            records.append((entry.path, stat.st_mtime_ns, stat.st_size))
+                    except OSError:
+                        continue
+
+        records.sort()
+        return tuple(records)
+
+    def Get(self, project_dir: Path, fingerprint: Tuple) -> Optional[ProjectInfo]:
+        """指纹匹配时返回缓存的项目信息，否则返回 None"""
+        cached = self._entries.get(str(project_dir))
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        return None
+
+    def Put(self, project_dir: Path, fingerprint: Tuple, project_info: ProjectInfo):
+        """记录项目分析结果"""
+        self._entries[str(project_dir)] = (fingerprint, project_info)
+        self._dirty = True
+
+    def Save(self):
+        """仅在有变更时写回磁盘"""
+        if not self._dirty:
+            return
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_path, 'wb') as f:
+                pickle.dump(
+                    {'version': CACHE_VERSION, 'entries': self._entries},
+                    f, protocol=pickle.HIGHEST_PROTOCOL
+                )
+            self._dirty = False
+        except (OSError, pickle.PickleError) as e:
+            logger.debug(f"写入发现缓存失败: {e}")
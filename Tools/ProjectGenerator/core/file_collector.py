@@ -5,8 +5,9 @@
 """
 
 import logging
+import os
 from pathlib import Path
-from typing import Set
+from typing import Iterator, Set, Tuple
 
 from Tools.ProjectGenerator.core.project_info import ProjectInfo, FileGroup
 
@@ -23,94 +24,128 @@ class FileCollector:
     CONFIG_EXTENSIONS = {'.json', '.xml', '.yaml', '.yml', '.ini'}
     META_EXTENSIONS = {'.py', '.cs', '.md', '.txt'}
     PROTO_EXTENSIONS = {'.proto'}
-    
+
+    # 扩展名到默认分组的查表（单次哈希查找取代链式集合判断）
+    EXTENSION_GROUPS = {
+        **{ext: FileGroup.HEADERS for ext in HEADER_EXTENSIONS},
+        **{ext: FileGroup.SOURCES for ext in SOURCE_EXTENSIONS},
+        **{ext: FileGroup.CONFIGS for ext in CONFIG_EXTENSIONS},
+        **{ext: FileGroup.META for ext in PROTO_EXTENSIONS},
+    }
+
+    # 顶层子目录名到允许分组的映射
+    DIRECTORY_GROUPS = {
+        "Sources": frozenset({FileGroup.HEADERS, FileGroup.SOURCES}),
+        "Meta": frozenset({FileGroup.META}),
+        "Configs": frozenset({FileGroup.CONFIGS}),
+        # Protos 目录下的文件作为 META 文件处理
+        "Protos": frozenset({FileGroup.META}),
+    }
+
+    # 项目根目录下直接收集的项目文件类型
+    PROJECT_FILE_EXTENSIONS = {'.csproj', '.vcxproj', '.pbxproj'}
+
+    # 遍历时整体跳过的目录
+    IGNORED_DIRECTORIES = frozenset({'__pycache__', 'node_modules', 'bin', 'obj'})
+
     def CollectFiles(self, project_info: ProjectInfo, project_root: Path):
         """
         收集项目文件
-        
+
+        对项目目录只做一次 scandir：目录条目按名称分派到对应的
+        文件分组收集，根目录下的项目文件（.csproj 等）顺带收集，
+        省去按子目录逐个 exists() 探测和多次遍历。
+
         Args:
             project_info: 项目信息对象
             project_root: 项目根目录
         """
         project_dir = project_info.path
-        
-        # 收集 Sources 目录下的文件
-        sources_dir = project_dir / "Sources"
-        if sources_dir.exists():
-            self._CollectDirectoryFiles(
-                sources_dir, project_info, project_root,
-                {FileGroup.HEADERS, FileGroup.SOURCES}
-            )
-        
-        # 收集 Meta 目录下的文件
-        meta_dir = project_dir / "Meta"
-        if meta_dir.exists():
-            self._CollectDirectoryFiles(
-                meta_dir, project_info, project_root,
-                {FileGroup.META}
-            )
-        
-        # 收集 Configs 目录下的文件
-        configs_dir = project_dir / "Configs"
-        if configs_dir.exists():
-            self._CollectDirectoryFiles(
-                configs_dir, project_info, project_root,
-                {FileGroup.CONFIGS}
-            )
-        
-        # 收集 Protos 目录下的文件 (作为META文件处理)
-        protos_dir = project_dir / "Protos"
-        if protos_dir.exists():
-            self._CollectDirectoryFiles(
-                protos_dir, project_info, project_root,
-                {FileGroup.META}
-            )
-        
-        # 收集项目根目录下的项目文件
-        self._CollectProjectFiles(project_dir, project_info, project_root)
-        
-        logger.debug(f"项目 {project_info.name} 文件收集完成:")
-        for group in FileGroup:
-            count = len(project_info.files[group])
-            if count > 0:
-                logger.debug(f"  {group.value}: {count} 个文件")
+
+        try:
+            entries = os.scandir(project_dir)
+        except OSError:
+            return
+
+        with entries:
+            for entry in entries:
+                name = entry.name
+                # 切片比较比 str.startswith 少一次方法分派
+                if name[:1] == '.':
+                    continue
+
+                if entry.is_dir(follow_symlinks=False):
+                    allowed_groups = self.DIRECTORY_GROUPS.get(name)
+                    if allowed_groups:
+                        self._CollectDirectoryFiles(
+                            Path(entry.path), project_info, project_root,
+                            allowed_groups
+                        )
+                elif entry.is_file():
+                    # 收集项目根目录下的项目文件（如 .csproj）
+                    dot_index = name.rfind('.')
+                    if dot_index > 0 and name[dot_index:].lower() in self.PROJECT_FILE_EXTENSIONS:
+                        project_info.AddFile(Path(entry.path), FileGroup.META, project_root)
+
+        # DEBUG 未开启时跳过整个统计块，避免白做 f-string 格式化和计数
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"项目 {project_info.name} 文件收集完成:")
+            for group in FileGroup:
+                count = len(project_info.GetFiles(group))
+                if count > 0:
+                    logger.debug(f"  {group.value}: {count} 个文件")
     
+    def _IterFiles(self, root: Path) -> Iterator[Tuple[str, str]]:
+        """递归遍历目录下的所有文件
+
+        基于 os.scandir 实现：DirEntry 的 is_file/is_dir 直接复用
+        readdir 的结果，相比 rglob 省去每个条目的额外 stat 调用和
+        Path 对象构造。
+
+        Yields:
+            (文件绝对路径字符串, 文件名) 元组
+        """
+        stack = [str(root)]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    name = entry.name
+                    # 跳过隐藏文件/目录（切片比较，省去 startswith 的方法调用）
+                    if name[:1] == '.':
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if name not in self.IGNORED_DIRECTORIES:
+                                stack.append(entry.path)
+                        elif entry.is_file():
+                            yield entry.path, name
+                    except OSError:
+                        continue
+
     def _CollectDirectoryFiles(
-        self, 
-        directory: Path, 
-        project_info: ProjectInfo, 
+        self,
+        directory: Path,
+        project_info: ProjectInfo,
         project_root: Path,
         allowed_groups: Set[FileGroup]
     ):
         """收集指定目录下的文件"""
-        for file_path in directory.rglob("*"):
-            if not file_path.is_file():
-                continue
-            
-            # 跳过隐藏文件
-            if file_path.name.startswith('.'):
-                continue
-            
+        for file_path_str, file_name in self._IterFiles(directory):
             # 确定文件分组（传递目录上下文）
-            file_extension = file_path.suffix.lower()
+            dot_index = file_name.rfind('.')
+            file_extension = file_name[dot_index:].lower() if dot_index > 0 else ''
             file_group = self._DetermineFileGroup(file_extension, directory)
-            
+
             # 检查是否允许此分组
             if file_group not in allowed_groups:
                 continue
-            
+
             # 添加文件到项目
-            project_info.AddFile(file_path, file_group, project_root)
-    
-    def _CollectProjectFiles(self, project_dir: Path, project_info: ProjectInfo, project_root: Path):
-        """收集项目文件（如 .csproj）"""
-        for file_path in project_dir.glob("*"):
-            if not file_path.is_file():
-                continue
-            
-            # 收集项目配置文件
-            if file_path.suffix.lower() in {'.csproj', '.vcxproj', '.pbxproj'}:
-                project_info.AddFile(file_path, FileGroup.META, project_root)
+            project_info.AddFile(Path(file_path_str), file_group, project_root)
     
     def _DetermineFileGroup(self, file_extension: str, directory: Path = None) -> FileGroup:
         """根据文件扩展名和目录上下文确定文件分组"""
@@ -129,15 +164,6 @@ class FileCollector:
             # 对于Protos目录中的文件，强制归类为META
             elif directory_name == "protos":
                 return FileGroup.META
-        
-        # 默认基于扩展名的分类逻辑
-        if file_extension in self.HEADER_EXTENSIONS:
-            return FileGroup.HEADERS
-        elif file_extension in self.SOURCE_EXTENSIONS:
-            return FileGroup.SOURCES
-        elif file_extension in self.CONFIG_EXTENSIONS:
-            return FileGroup.CONFIGS
-        elif file_extension in self.PROTO_EXTENSIONS:
-            return FileGroup.META
-        else:
-            return FileGroup.META
\ No newline at end of file
+
+        # 默认基于扩展名的分类逻辑（查表，未知扩展名归为 META）
+        return self.EXTENSION_GROUPS.get(file_extension, FileGroup.META)
\ No newline at end of file
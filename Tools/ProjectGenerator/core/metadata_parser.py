@@ -5,7 +5,9 @@
 """
 
 import ast
+import hashlib
 import logging
+import pickle
 import re
 from pathlib import Path
 from typing import Dict, Any, Optional
@@ -14,9 +16,104 @@ from typing import Dict, Any, Optional
 logger = logging.getLogger(__name__)
 
 
+# Python 构建文件解析结果缓存: 路径 -> (mtime_ns, size, 元数据字典)
+_PY_BUILD_CACHE = {}
+
+
+# 元数据缓存格式版本号，缓存结构或解析逻辑变化时递增以废弃旧缓存
+METADATA_CACHE_VERSION = "2"
+
+
+def _HashContent(content: bytes) -> bytes:
+    """计算构建文件内容的短摘要（内容寻址缓存的键）"""
+    return hashlib.blake2b(content, digest_size=8).digest()
+
+
+class MetadataCache:
+    """构建元数据的内容寻址持久缓存
+
+    以文件内容摘要为键缓存解析结果：内容不变则结果必然相同，
+    热启动时命中缓存即可完全跳过 AST 解析和正则匹配。
+    与调用方的 mtime+size 快速检查配合，仅在快速检查未命中时才计算摘要。
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_path = cache_dir / "metadata.pkl"
+        self._entries = {}
+        self._dirty = False
+        self._Load()
+
+    def _Load(self):
+        """从磁盘加载缓存，版本不匹配或损坏时丢弃"""
+        try:
+            with open(self.cache_path, 'rb') as f:
+                payload = pickle.load(f)
+        except (OSError, EOFError, pickle.PickleError, AttributeError, ImportError):
+            return
+
+        if isinstance(payload, dict) and payload.get('version') == METADATA_CACHE_VERSION:
+            self._entries = payload.get('entries', {})
+
+    def Get(self, digest: bytes) -> Optional[Dict[str, Any]]:
+        """按内容摘要查询缓存的解析结果"""
+        return self._entries.get(digest)
+
+    def Put(self, digest: bytes, result: Dict[str, Any]):
+        """记录解析结果"""
+        self._entries[digest] = result
+        self._dirty = True
+
+    def Save(self):
+        """仅在有变更时写回磁盘"""
+        if not self._dirty:
+            return
+
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_path, 'wb') as f:
+                pickle.dump(
+                    {'version': METADATA_CACHE_VERSION, 'entries': self._entries},
+                    f, protocol=pickle.HIGHEST_PROTOCOL
+                )
+            self._dirty = False
+        except (OSError, pickle.PickleError) as e:
+            logger.debug(f"写入元数据缓存失败: {e}")
+
+
+# C# 构建文件中 NutTarget 派生类声明（模块级预编译，按具体基类优先匹配）
+_CS_CLASS_PATTERN = re.compile(
+    r'class\s+(\w+)\s*:\s*(Nut(?:Service|Docker|Kubernetes|StaticLibrary|Executable)?Target)\b'
+)
+
+
+# C# 基类到项目类型的映射（模块级常量，避免每次调用重新构建字典）
+_CLASS_TYPE_MAPPING = {
+    'NutServiceTarget': 'service',
+    'NutDockerTarget': 'docker',
+    'NutKubernetesTarget': 'kubernetes',
+    'NutStaticLibraryTarget': 'static_library',
+    'NutExecutableTarget': 'executable',
+    'NutTarget': 'csharp_target'  # 默认类型
+}
+
+
 class MetadataParser:
     """元数据解析器"""
-    
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        """
+        初始化解析器
+
+        Args:
+            cache_dir: 持久缓存目录（如 .nutgen-cache），为 None 时不启用持久缓存
+        """
+        self.persistent_cache = MetadataCache(cache_dir) if cache_dir else None
+
+    def SaveCache(self):
+        """将持久缓存写回磁盘"""
+        if self.persistent_cache is not None:
+            self.persistent_cache.Save()
+
     def ParsePythonBuildFile(self, build_file: Path) -> Dict[str, Any]:
         """
         解析 Python 构建文件
@@ -28,24 +125,46 @@ class MetadataParser:
             解析出的元数据字典
         """
         try:
-            # 读取文件内容
-            content = build_file.read_text(encoding='utf-8')
-            
-            # 解析 AST
-            tree = ast.parse(content)
-            
-            # 查找 ServiceMeta 变量赋值
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Assign):
-                    for target in node.targets:
-                        if isinstance(target, ast.Name) and target.id == 'ServiceMeta':
-                            # 提取字典值
-                            if isinstance(node.value, ast.Dict):
-                                return self._ExtractDictFromAst(node.value)
-            
-            logger.warning(f"未找到 ServiceMeta 定义: {build_file}")
-            return {}
-            
+            # 文件未变化时直接复用缓存的解析结果
+            stat = build_file.stat()
+            cache_key = str(build_file)
+            cached = _PY_BUILD_CACHE.get(cache_key)
+            if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                return cached[2]
+
+            # 读取文件内容（字节级预过滤，没有 ServiceMeta 时跳过 AST 解析）
+            content = build_file.read_bytes()
+
+            # 二级缓存：内容摘要命中时直接复用持久化的解析结果
+            digest = None
+            if self.persistent_cache is not None:
+                digest = _HashContent(content)
+                cached_result = self.persistent_cache.Get(digest)
+                if cached_result is not None:
+                    _PY_BUILD_CACHE[cache_key] = (stat.st_mtime_ns, stat.st_size, cached_result)
+                    return cached_result
+
+            result = {}
+            if b'ServiceMeta' in content:
+                # ServiceMeta 是模块顶层赋值，只需遍历 tree.body，
+                # 无需 ast.walk 递归所有子节点
+                tree = ast.parse(content, filename=str(build_file))
+                for node in tree.body:
+                    if isinstance(node, ast.Assign):
+                        for target in node.targets:
+                            if isinstance(target, ast.Name) and target.id == 'ServiceMeta':
+                                # 提取字典值
+                                if isinstance(node.value, ast.Dict):
+                                    result = self._ExtractDictFromAst(node.value)
+
+            if not result:
+                logger.warning(f"未找到 ServiceMeta 定义: {build_file}")
+
+            _PY_BUILD_CACHE[cache_key] = (stat.st_mtime_ns, stat.st_size, result)
+            if digest is not None:
+                self.persistent_cache.Put(digest, result)
+            return result
+
         except Exception as e:
             logger.error(f"解析 Python 构建文件失败 {build_file}: {e}")
             return {}
@@ -61,37 +180,48 @@ class MetadataParser:
             解析出的元数据字典
         """
         try:
-            content = build_file.read_text(encoding='utf-8')
-            
-            # 提取类名和基类
-            class_patterns = [
-                r'class\s+(\w+)\s*:\s*NutServiceTarget',
-                r'class\s+(\w+)\s*:\s*NutDockerTarget', 
-                r'class\s+(\w+)\s*:\s*NutKubernetesTarget',
-                r'class\s+(\w+)\s*:\s*NutStaticLibraryTarget',
-                r'class\s+(\w+)\s*:\s*NutExecutableTarget',
-                r'class\s+(\w+)\s*:\s*NutTarget'  # 向后兼容
-            ]
-            
-            for pattern in class_patterns:
-                class_match = re.search(pattern, content)
-                if class_match:
-                    class_name = class_match.group(1)
-                    base_class = pattern.split(':')[1].split('\\')[0].strip().replace('s*', '')
-                    
-                    # 根据基类确定项目类型
-                    project_type = self._DetermineProjectTypeFromClass(base_class)
-                    
-                    return {
-                        'name': class_name.replace('Target', ''),
-                        'type': project_type,
-                        'class_name': class_name,
-                        'base_class': base_class
-                    }
-                
+            content = build_file.read_bytes()
+
+            # 内容摘要命中时跳过正则匹配
+            digest = None
+            if self.persistent_cache is not None:
+                digest = _HashContent(content)
+                cached_result = self.persistent_cache.Get(digest)
+                if cached_result is not None:
+                    return cached_result
+
+            # 字节级预过滤：派生类声明形如 class XxxTarget : NutServiceTarget，
+            # 基类名各不相同但都以 Target 结尾，以此为标记跳过无谓的正则匹配
+            if b'Target' not in content:
+                logger.warning(f"未找到 NutTarget 派生类: {build_file}")
+                if digest is not None:
+                    self.persistent_cache.Put(digest, {})
+                return {}
+
+            # 构建文件只有数百字节，整体解码后全文匹配
+            class_match = _CS_CLASS_PATTERN.search(content.decode('utf-8', errors='ignore'))
+            if class_match:
+                class_name = class_match.group(1)
+                base_class = class_match.group(2)
+
+                # 根据基类确定项目类型
+                project_type = self._DetermineProjectTypeFromClass(base_class)
+
+                result = {
+                    'name': class_name.replace('Target', ''),
+                    'type': project_type,
+                    'class_name': class_name,
+                    'base_class': base_class
+                }
+                if digest is not None:
+                    self.persistent_cache.Put(digest, result)
+                return result
+
             logger.warning(f"未找到 NutTarget 派生类: {build_file}")
+            if digest is not None:
+                self.persistent_cache.Put(digest, {})
             return {}
-            
+
         except Exception as e:
             logger.error(f"解析 C# 构建文件失败 {build_file}: {e}")
             return {}
@@ -133,13 +263,4 @@ class MetadataParser:
     
     def _DetermineProjectTypeFromClass(self, base_class: str) -> str:
         """根据C#基类确定项目类型"""
-        class_type_mapping = {
-            'NutServiceTarget': 'service',
-            'NutDockerTarget': 'docker',
-            'NutKubernetesTarget': 'kubernetes',
-            'NutStaticLibraryTarget': 'static_library',
-            'NutExecutableTarget': 'executable',
-            'NutTarget': 'csharp_target'  # 默认类型
-        }
-        
-        return class_type_mapping.get(base_class, 'unknown')
\ No newline at end of file
+        return _CLASS_TYPE_MAPPING.get(base_class, 'unknown')
\ No newline at end of file
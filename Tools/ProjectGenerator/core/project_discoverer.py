@@ -5,17 +5,66 @@
 """
 
 import logging
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from Tools.ProjectGenerator.core.project_info import ProjectInfo, ProjectType
 from Tools.ProjectGenerator.core.metadata_parser import MetadataParser
 from Tools.ProjectGenerator.core.file_collector import FileCollector
+from Tools.ProjectGenerator.core.discovery_cache import ProjectDiscoveryCache
 
 
 logger = logging.getLogger(__name__)
 
 
+# 搜索项目目录时跳过的非源码目录
+_PRUNE_DIRS = frozenset({
+    '.git', '.vs', 'node_modules', 'bin', 'obj',
+    'Intermediate', 'Binary', 'Binaries', '__pycache__'
+})
+
+# 入口函数特征（按字节匹配，避免解码整个文件）
+_CS_MAIN_NEEDLES = (b'static void Main(', b'static async Task Main(')
+_CPP_MAIN_NEEDLES = (b'int main(',)
+
+# "包含 main 函数" 检测结果缓存: 路径 -> (mtime_ns, size, has_main)
+_MAIN_SCAN_CACHE = {}
+
+
+def _FileContainsAny(file_path: Path, needles) -> bool:
+    """检查文件内容是否包含任一特征字节串
+
+    通过 mmap 直接在页缓存上做 bytes.find，既不复制文件内容
+    也不做 UTF-8 解码。结果按 (mtime_ns, size) 缓存，
+    文件未变化时不重复扫描。
+    """
+    try:
+        stat = file_path.stat()
+    except OSError:
+        return False
+
+    key = str(file_path)
+    cached = _MAIN_SCAN_CACHE.get(key)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    has_match = False
+    # 比最短特征串还小的文件不可能匹配（顺带排除 mmap 不接受的空文件）
+    if stat.st_size >= min(len(needle) for needle in needles):
+        try:
+            with open(file_path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    has_match = any(mm.find(needle) != -1 for needle in needles)
+        except (OSError, ValueError):
+            has_match = False
+
+    _MAIN_SCAN_CACHE[key] = (stat.st_mtime_ns, stat.st_size, has_match)
+    return has_match
+
+
 class ProjectDiscoverer:
     """项目发现器"""
     
@@ -28,9 +77,10 @@ class ProjectDiscoverer:
         """
         self.project_root = Path(project_root).resolve()
         self.source_dir = self.project_root / "Source"
-        self.metadata_parser = MetadataParser()
+        self.metadata_parser = MetadataParser(self.project_root / ".nutgen-cache")
         self.file_collector = FileCollector()
-        
+        self.discovery_cache = ProjectDiscoveryCache(self.project_root)
+
         if not self.source_dir.exists():
             raise ValueError(f"源代码目录不存在: {self.source_dir}")
     
@@ -42,39 +92,70 @@ class ProjectDiscoverer:
             项目信息列表
         """
         projects = []
-        
+
         logger.info(f"开始搜索项目目录: {self.source_dir}")
-        
-        # 搜索所有可能的项目目录
-        for project_dir in self._FindProjectDirectories():
-            try:
-                project_info = self._AnalyzeProjectDirectory(project_dir)
+
+        project_dirs = self._FindProjectDirectories()
+
+        # 每个项目的分析都是独立的 I/O 密集任务，用线程池并行处理；
+        # 结果按 project_dirs 的顺序收集，保持确定性输出
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self._AnalyzeWithCache, d) for d in project_dirs]
+
+            for project_dir, future in zip(project_dirs, futures):
+                try:
+                    fingerprint, project_info, from_cache = future.result()
+                except Exception as e:
+                    logger.warning(f"分析项目目录失败 {project_dir}: {e}")
+                    continue
+
                 if project_info:
+                    if not from_cache:
+                        self.discovery_cache.Put(project_dir, fingerprint, project_info)
                     projects.append(project_info)
                     logger.info(f"发现项目: {project_info.name} ({project_info.project_type.value})")
-            except Exception as e:
-                logger.warning(f"分析项目目录失败 {project_dir}: {e}")
-        
+
+        self.discovery_cache.Save()
+        self.metadata_parser.SaveCache()
         logger.info(f"共发现 {len(projects)} 个项目")
         return projects
+
+    def _AnalyzeWithCache(self, project_dir: Path) -> Tuple[Tuple, Optional[ProjectInfo], bool]:
+        """分析单个项目目录，目录未变化时复用缓存结果
+
+        Returns:
+            (指纹, 项目信息或 None, 是否命中缓存)
+        """
+        fingerprint = self.discovery_cache.ComputeFingerprint(project_dir)
+        project_info = self.discovery_cache.Get(project_dir, fingerprint)
+        if project_info is not None:
+            return fingerprint, project_info, True
+
+        return fingerprint, self._AnalyzeProjectDirectory(project_dir), False
     
     def _FindProjectDirectories(self) -> List[Path]:
-        """查找所有可能的项目目录"""
-        project_dirs = []
-        
-        # 搜索包含构建文件的目录
-        for build_file in self.source_dir.rglob("*.Build.cs"):
-            project_dirs.append(build_file.parent.parent)
-            
-        for build_file in self.source_dir.rglob("*.Build.py"):
-            project_dirs.append(build_file.parent.parent)
-            
-        # 搜索包含 .csproj 文件的目录
-        for csproj_file in self.source_dir.rglob("*.csproj"):
-            project_dirs.append(csproj_file.parent)
-        
+        """查找所有可能的项目目录
+
+        单次 os.walk 同时识别构建文件和 .csproj，
+        并在下降前剪掉明显的非源码目录，避免三次完整遍历。
+        """
+        project_dirs = set()
+
+        for root, dirs, files in os.walk(self.source_dir):
+            # 原地剪枝，阻止 os.walk 进入被忽略的目录
+            dirs[:] = [d for d in dirs if d not in _PRUNE_DIRS and not d.startswith('.')]
+
+            for file_name in files:
+                # 搜索包含构建文件的目录
+                if file_name.endswith(('.Build.cs', '.Build.py')):
+                    project_dirs.add(Path(root).parent)
+                # 搜索包含 .csproj 文件的目录
+                elif file_name.endswith('.csproj'):
+                    project_dirs.add(Path(root))
+
         # 去重并排序
-        return sorted(set(project_dirs))
+        return sorted(project_dirs)
     
     def _AnalyzeProjectDirectory(self, project_dir: Path) -> Optional[ProjectInfo]:
         """
@@ -119,12 +200,8 @@ class ProjectDiscoverer:
         if list(project_dir.glob("*.csproj")):
             # 检查是否包含 Main 方法
             for cs_file in project_dir.rglob("*.cs"):
-                try:
-                    content = cs_file.read_text(encoding='utf-8')
-                    if 'static void Main(' in content or 'static async Task Main(' in content:
-                        return ProjectType.CSHARP_EXECUTABLE
-                except:
-                    continue
+                if _FileContainsAny(cs_file, _CS_MAIN_NEEDLES):
+                    return ProjectType.CSHARP_EXECUTABLE
             return ProjectType.CSHARP_LIBRARY
         
         # C++ 项目
@@ -132,24 +209,20 @@ class ProjectDiscoverer:
         if meta_dir.exists():
             # 检查 Build 文件
             if list(meta_dir.glob("*.Build.cs")) or list(meta_dir.glob("*.Build.py")):
-                # 检查是否包含 main 函数
+                # 检查是否包含 main 函数（先按文件名短路，避免读取内容）
                 sources_dir = project_dir / "Sources"
                 if sources_dir.exists():
                     for cpp_file in sources_dir.rglob("*Main.cpp"):
                         return ProjectType.EXECUTABLE
-                    
+
                     for cpp_file in sources_dir.rglob("main.cpp"):
                         return ProjectType.EXECUTABLE
-                        
+
                     # 检查文件内容中的 main 函数
                     for cpp_file in sources_dir.rglob("*.cpp"):
-                        try:
-                            content = cpp_file.read_text(encoding='utf-8')
-                            if 'int main(' in content:
-                                return ProjectType.EXECUTABLE
-                        except:
-                            continue
-                
+                        if _FileContainsAny(cpp_file, _CPP_MAIN_NEEDLES):
+                            return ProjectType.EXECUTABLE
+
                 return ProjectType.STATIC_LIBRARY
         
         return None
@@ -4,12 +4,41 @@
 定义项目元数据和文件组织结构
 """
 
+import itertools
+import os
+import sys
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Optional
 
 
+# 扩展名到 Xcode 文件类型的映射（模块级常量）
+_TYPE_MAP = {
+    '.h': 'sourcecode.c.h',
+    '.hpp': 'sourcecode.cpp.h',
+    '.hxx': 'sourcecode.cpp.h',
+    '.cpp': 'sourcecode.cpp.cpp',
+    '.cxx': 'sourcecode.cpp.cpp',
+    '.cc': 'sourcecode.cpp.cpp',
+    '.c': 'sourcecode.c.c',
+    '.cs': 'sourcecode.cs',
+    '.py': 'text.script.python',
+    '.json': 'text.json',
+    '.xml': 'text.xml',
+    '.proto': 'text',
+    '.md': 'text',
+    '.txt': 'text.plain'
+}
+
+
+@lru_cache(maxsize=64)
+def _SuffixToType(suffix: str) -> str:
+    """扩展名（已小写）到文件类型的查表，lru_cache 复用少数几种后缀的结果"""
+    return _TYPE_MAP.get(suffix, 'text')
+
+
 class ProjectType(Enum):
     """项目类型枚举"""
     EXECUTABLE = "executable"
@@ -27,18 +56,63 @@ class FileGroup(Enum):
     CONFIGS = "Configs"
 
 
-@dataclass
+@dataclass(slots=True)
 class FileInfo:
-    """文件信息"""
-    path: Path
-    relative_path: Path
+    """文件信息
+
+    按需构造的轻量记录视图：路径以字符串形式存储，
+    需要 Path 时再构造，常驻数据只有列存储（FileColumns）本身。
+    """
+    path_str: str
+    relative_path_str: str
     group: FileGroup
     file_type: str
-    
+
+    @property
+    def path(self) -> Path:
+        """获取绝对路径（按需构造 Path）"""
+        return Path(self.path_str)
+
+    @property
+    def relative_path(self) -> Path:
+        """获取相对路径（按需构造 Path）"""
+        return Path(self.relative_path_str)
+
     @property
     def name(self) -> str:
         """获取文件名"""
-        return self.path.name
+        return self.path_str.rsplit(os.sep, 1)[-1]
+
+
+@dataclass(slots=True)
+class FileColumns:
+    """单个分组的文件列存储
+
+    SoA 布局：按列保存路径/相对路径/文件类型三个平行列表，
+    取代每文件一个数据对象的 AoS 布局。迭代时按需产出
+    FileInfo 记录，供下游生成器以原有方式访问。
+    """
+    group: FileGroup
+    paths: List[str] = field(default_factory=list)
+    rel_paths: List[str] = field(default_factory=list)
+    file_types: List[str] = field(default_factory=list)
+
+    def Append(self, path_str: str, rel_path_str: str, file_type: str):
+        """追加一个文件（三列同步写入）"""
+        self.paths.append(path_str)
+        self.rel_paths.append(rel_path_str)
+        self.file_types.append(file_type)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __bool__(self) -> bool:
+        return bool(self.paths)
+
+    def __iter__(self):
+        group = self.group
+        for path_str, rel_path_str, file_type in zip(self.paths, self.rel_paths, self.file_types):
+            yield FileInfo(path_str, rel_path_str, group, file_type)
 
 
 @dataclass 
@@ -49,8 +123,8 @@ class ProjectInfo:
     project_type: ProjectType
     group_name: str = "Other"
     
-    # 文件组织
-    files: Dict[FileGroup, List[FileInfo]] = field(default_factory=dict)
+    # 文件组织（每个分组一个列存储）
+    files: Dict[FileGroup, FileColumns] = field(default_factory=dict)
     
     # 构建配置
     include_dirs: List[Path] = field(default_factory=list)
@@ -58,72 +132,76 @@ class ProjectInfo:
     
     # 元数据
     build_metadata: Dict = field(default_factory=dict)
-    
+
+    # 内部缓存：项目根目录前缀字符串（AddFile 懒初始化）
+    _root_prefix: Optional[str] = field(default=None, init=False, repr=False)
+
     def __post_init__(self):
         """初始化后处理"""
-        # 确保所有文件组都存在
-        for group in FileGroup:
-            if group not in self.files:
-                self.files[group] = []
+        # 分组名在项目间大量重复，intern 后共享同一字符串对象
+        self.group_name = sys.intern(self.group_name)
     
     def AddFile(self, file_path: Path, group: FileGroup, project_root: Path):
-        """添加文件到项目"""
-        if not file_path.exists():
-            return False
-            
-        # 确定文件类型
-        file_type = self._GetFileType(file_path)
-        relative_path = file_path.relative_to(project_root)
-        
-        file_info = FileInfo(
-            path=file_path,
-            relative_path=relative_path,
-            group=group,
-            file_type=file_type
-        )
-        
-        self.files[group].append(file_info)
+        """添加文件到项目
+
+        调用方都来自 scandir/walk 遍历，文件必然存在，
+        这里不再做 exists() 探测；相对路径直接按字符串前缀裁剪，
+        避免 Path.relative_to 的逐段比较。
+        """
+        path_str = str(file_path)
+
+        # 从原始文件名直接切出扩展名，避免构造 PurePath.suffix；
+        # 查表结果是 _TYPE_MAP 中的常量字符串，天然跨文件共享
+        name = path_str.rsplit(os.sep, 1)[-1]
+        dot_index = name.rfind('.')
+        suffix = name[dot_index:].lower() if dot_index > 0 else ''
+        file_type = _SuffixToType(suffix)
+
+        root_prefix = self._root_prefix
+        if root_prefix is None:
+            root_prefix = str(project_root) + os.sep
+            self._root_prefix = root_prefix
+
+        if path_str.startswith(root_prefix):
+            relative_path_str = path_str[len(root_prefix):]
+        else:
+            relative_path_str = str(file_path.relative_to(project_root))
+
+        # 分组列存储按需创建，未用到的分组不分配空列表
+        columns = self.files.get(group)
+        if columns is None:
+            columns = self.files[group] = FileColumns(group)
+
+        columns.Append(path_str, relative_path_str, file_type)
         return True
-    
+
+    def GetFiles(self, group: FileGroup):
+        """获取指定分组的文件（分组为空时返回空元组，不触发插入）"""
+        return self.files.get(group, ())
+
+    def IterAllFiles(self):
+        """按分组顺序惰性迭代所有文件（不物化列表）"""
+        return itertools.chain.from_iterable(
+            self.files.get(group, ()) for group in FileGroup
+        )
+
     def GetAllFiles(self) -> List[FileInfo]:
-        """获取所有文件"""
-        all_files = []
-        for group in FileGroup:
-            all_files.extend(self.files[group])
-        return all_files
-    
-    def GetSourceFiles(self) -> List[FileInfo]:
+        """获取所有文件（需要多次遍历或索引时使用）"""
+        return list(self.IterAllFiles())
+
+    def GetSourceFiles(self):
         """获取源文件"""
-        return self.files[FileGroup.SOURCES]
-    
-    def GetHeaderFiles(self) -> List[FileInfo]:
+        return self.GetFiles(FileGroup.SOURCES)
+
+    def GetHeaderFiles(self):
         """获取头文件"""
-        return self.files[FileGroup.HEADERS]
+        return self.GetFiles(FileGroup.HEADERS)
     
     @staticmethod
     def _GetFileType(file_path: Path) -> str:
         """根据文件扩展名确定文件类型"""
-        suffix = file_path.suffix.lower()
-        
-        type_map = {
-            '.h': 'sourcecode.c.h',
-            '.hpp': 'sourcecode.cpp.h', 
-            '.hxx': 'sourcecode.cpp.h',
-            '.cpp': 'sourcecode.cpp.cpp',
-            '.cxx': 'sourcecode.cpp.cpp',
-            '.cc': 'sourcecode.cpp.cpp',
-            '.c': 'sourcecode.c.c',
-            '.cs': 'sourcecode.cs',
-            '.py': 'text.script.python',
-            '.json': 'text.json',
-            '.xml': 'text.xml',
-            '.proto': 'text',
-            '.md': 'text',
-            '.txt': 'text.plain'
-        }
-        
-        return type_map.get(suffix, 'text')
-    
+        return _SuffixToType(file_path.suffix.lower())
+
     @property
     def is_executable(self) -> bool:
         """是否为可执行项目"""
@@ -5,9 +5,14 @@
 """
 
 import logging
+import os
+import string
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
+from xml.sax.saxutils import escape
 
 from Tools.ProjectGenerator.core.project_info import ProjectInfo
 from Tools.ProjectGenerator.utils.uuid_generator import UuidGenerator
@@ -16,6 +21,26 @@ from Tools.ProjectGenerator.utils.uuid_generator import UuidGenerator
 logger = logging.getLogger(__name__)
 
 
+# 项目名/分组名中绝大多数字符都是安全的；只有命中集合外字符时
+# 才付转义成本
+_XML_SAFE_CHARS = frozenset(string.ascii_letters + string.digits + "._-\\/")
+
+
+@lru_cache(maxsize=None)
+def EscapeXmlName(value: str) -> str:
+    """按需转义用于 XML 输出的名字
+
+    相对路径已在生成时转义，这里只处理可能带任意字符的
+    项目名/分组名；全部安全字符时原样返回，结果按值缓存。
+    结果会被拼入双引号属性，因此双引号必须转义为 &quot;
+    （quoteattr 对含双引号的值会改用单引号定界，去掉定界符
+    后双引号就漏掉了，不能用在这里）。
+    """
+    if all(c in _XML_SAFE_CHARS for c in value):
+        return value
+    return escape(value, {'"': '&quot;'})
+
+
 class BaseGenerator(ABC):
     """项目文件生成器基类"""
     
@@ -30,7 +55,10 @@ class BaseGenerator(ABC):
         self.project_root = Path(project_root).resolve()
         self.template_dir = template_dir or self._GetDefaultTemplateDir()
         self.uuid_generator = UuidGenerator()
-        
+        # 已确认存在的输出目录：同组多个项目共享目录，
+        # 只在首次遇到时真正调用 mkdir
+        self._ensured_dirs = set()
+
         if not self.project_root.exists():
             raise ValueError(f"项目根目录不存在: {self.project_root}")
     
@@ -47,6 +75,15 @@ class BaseGenerator(ABC):
         """
         pass
     
+    @classmethod
+    def ShouldGenerate(cls, project_info: ProjectInfo) -> bool:
+        """判断是否需要为该项目生成文件
+
+        驱动循环（尤其是并行路径）可据此跳过整个 GenerateProject
+        调度，而不是提交任务后在内部返回 None。
+        """
+        return True
+
     def GenerateProjects(self, projects: List[ProjectInfo]) -> List[Path]:
         """
         批量生成项目文件
@@ -68,14 +105,52 @@ class BaseGenerator(ABC):
                 logger.error(f"生成项目 {project_info.name} 失败: {e}")
         
         return generated_files
-    
+
+    def GenerateAll(self, projects: List[ProjectInfo]) -> List[Path]:
+        """
+        并行批量生成项目文件
+
+        各项目的生成互相独立且写入不同文件，用线程池并行分摊
+        字符串构建与写盘耗时；项目数较少时线程开销不划算，
+        直接走串行路径。
+
+        Args:
+            projects: 项目信息列表
+
+        Returns:
+            生成的项目文件路径列表（与输入顺序一致）
+        """
+        projects = [p for p in projects if self.ShouldGenerate(p)]
+        if len(projects) < 8:
+            return self.GenerateProjects(projects)
+
+        generated_files = []
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self.GenerateProject, project_info)
+                for project_info in projects
+            ]
+            for project_info, future in zip(projects, futures):
+                try:
+                    project_file = future.result()
+                    generated_files.append(project_file)
+                    logger.info(f"生成项目文件: {project_file}")
+                except Exception as e:
+                    logger.error(f"生成项目 {project_info.name} 失败: {e}")
+
+        return generated_files
+
     def _GetDefaultTemplateDir(self) -> Path:
         """获取默认模板目录"""
         return Path(__file__).parent.parent / "templates"
     
     def _EnsureOutputDirectory(self, output_path: Path) -> Path:
-        """确保输出目录存在"""
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        """确保输出目录存在（每个目录只 mkdir 一次）"""
+        directory = output_path.parent
+        if directory not in self._ensured_dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(directory)
         return output_path
     
     def _GetRelativePath(self, target_path: Path, base_path: Path) -> Path:
@@ -6,24 +6,61 @@ clangd 配置生成器
 提供完整的代码补全和语法检查支持。
 """
 
+import filecmp
+import hashlib
 import json
 import logging
 import os
+import platform
 import subprocess
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Set, Any
+from typing import List, Dict, Optional, Set, Any
 
 from Tools.ProjectGenerator.core.project_info import ProjectInfo
 
 logger = logging.getLogger(__name__)
 
 
+# libyaml C 扩展不可用时退回纯 Python Dumper；
+# PyYAML 本身是可选加速依赖，未安装时走手写序列化回退
+_YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper) if yaml is not None else None
+
+# 宿主平台在进程生命周期内不变，模块级求值一次
+_IS_DARWIN = platform.system() == "Darwin"
+
+# 配置模板版本：BuildClangdConfig 的输出结构变化时递增，
+# 强制指纹失配并重建所有配置文件
+_CONFIG_FORMAT_VERSION = "1"
+
+
+# 全局包含目录扫描时跳过的非源码目录
+_WALK_PRUNE_DIRS = frozenset({
+    '.git', '.vs', 'node_modules', '__pycache__', 'bin', 'obj', 'Binary'
+})
+
+
 class ClangdGenerator:
     """clangd 配置生成器"""
     
     def __init__(self, project_root: Path):
         self.project_root = project_root
         self.output_dir = project_root
+        # 全局包含目录和编译参数在一次生成内不会变化，按实例缓存
+        self._global_include_dirs: Optional[Set[str]] = None
+        self._base_args: Optional[tuple] = None
+        self._global_include_flags: Optional[tuple] = None
+        self._compiler_args_cache: Dict[frozenset, List[str]] = {}
         
     def GenerateClangdConfigs(self, projects: List[ProjectInfo]) -> Dict[str, Path]:
         """
@@ -35,22 +72,67 @@ class ClangdGenerator:
         generated_files = {}
         
         try:
+            # 预先完成全局包含目录遍历，避免并行任务竞争首次计算，
+            # 并按约定布局并入各项目的生成头文件目录
+            cpp_projects = [p for p in projects if not p.is_csharp]
+            self.CollectGlobalIncludeDirs()
+            self._AddProjectGeneratedDirs(cpp_projects)
+
+            # 指纹未变时各输出均可独立跳过：.clangd 内容只依赖包含目录，
+            # compile_commands 条目额外依赖源文件（其增量逻辑单独处理）
+            fingerprint = self._ComputeIncludeFingerprint(cpp_projects)
+            fingerprint_hit = fingerprint == self._LoadCachedFingerprint()
+
             # 1. 生成全局 .clangd 配置文件
-            clangd_config_path = self.GenerateGlobalClangdConfig()
-            if clangd_config_path:
-                generated_files['clangd_config'] = clangd_config_path
+            global_config_path = self.project_root / ".clangd"
+            if fingerprint_hit and global_config_path.exists():
+                logger.info(f"全局 clangd 配置未变化，跳过: {global_config_path}")
+                generated_files['clangd_config'] = global_config_path
+            else:
+                clangd_config_path = self.GenerateGlobalClangdConfig()
+                if clangd_config_path:
+                    generated_files['clangd_config'] = clangd_config_path
             
-            # 2. 生成 compile_commands.json
-            compile_commands_path = self.GenerateCompileCommands(projects)
+            # 2. 生成 compile_commands.json（传入预过滤的 C++ 项目列表）
+            compile_commands_path = self.GenerateCompileCommands(
+                cpp_projects, fingerprint=fingerprint,
+                fingerprint_hit=fingerprint_hit
+            )
             if compile_commands_path:
                 generated_files['compile_commands'] = compile_commands_path
             
             # 3. 为每个 C++ 项目生成单独的配置
-            for project in projects:
-                if not project.is_csharp:  # 只处理 C++ 项目
-                    project_config_path = self.GenerateProjectSpecificConfig(project)
-                    if project_config_path:
-                        generated_files[f'{project.name}_config'] = project_config_path
+            # 指纹命中且文件已存在的项目无需重建内容；
+            # 其余项目的包含目录发现是 I/O 密集操作，用线程池并行构建，
+            # 写入统一收拢到最后的批量循环，按项目顺序保持确定性输出
+            stale_projects = []
+            for project in cpp_projects:
+                config_path = project.path / ".clangd"
+                if fingerprint_hit and config_path.exists():
+                    generated_files[f'{project.name}_config'] = config_path
+                else:
+                    stale_projects.append(project)
+
+            max_workers = min(32, (os.cpu_count() or 1) * 4)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(self._BuildProjectSpecificConfig, project)
+                    for project in stale_projects
+                ]
+                pending_writes = [
+                    (project, future.result())
+                    for project, future in zip(stale_projects, futures)
+                ]
+
+            for project, (config_path, config_content) in pending_writes:
+                try:
+                    self._WriteFileBytes(config_path, config_content.encode('utf-8'))
+                    logger.debug(f"生成项目特定 clangd 配置: {config_path}")
+                    generated_files[f'{project.name}_config'] = config_path
+                except OSError as e:
+                    logger.error(f"写入项目 .clangd 配置文件失败: {e}")
+
+            self._SaveCachedFingerprint(fingerprint)
             
             logger.info(f"成功生成 {len(generated_files)} 个 clangd 配置文件")
             return generated_files
@@ -63,15 +145,11 @@ class ClangdGenerator:
         """生成全局 .clangd 配置文件"""
         config_path = self.project_root / ".clangd"
         
-        # 收集所有包含目录
-        include_dirs = self.CollectGlobalIncludeDirs()
-        
-        # 生成配置内容
-        config_content = self.BuildClangdConfig(include_dirs)
+        # 全局配置没有项目特有增量，参数即基础参数加全局 -I 前缀
+        config_content = self.BuildClangdConfig(set())
         
         try:
-            with open(config_path, 'w', encoding='utf-8') as f:
-                f.write(config_content)
+            self._WriteFileBytes(config_path, config_content.encode('utf-8'))
             
             logger.info(f"生成全局 clangd 配置: {config_path}")
             return config_path
@@ -80,55 +158,207 @@ class ClangdGenerator:
             logger.error(f"写入 .clangd 配置文件失败: {e}")
             return None
     
-    def GenerateCompileCommands(self, projects: List[ProjectInfo]) -> Path:
-        """生成 compile_commands.json"""
-        compile_commands = []
-        
-        # 为每个 C++ 项目生成编译命令
-        for project in projects:
-            if not project.is_csharp:
-                project_commands = self.GenerateProjectCompileCommands(project)
-                compile_commands.extend(project_commands)
-        
-        # 写入文件
+    def GenerateCompileCommands(
+        self,
+        projects: List[ProjectInfo],
+        fingerprint: Optional[str] = None,
+        fingerprint_hit: Optional[bool] = None
+    ) -> Path:
+        """生成 compile_commands.json
+
+        增量更新：包含目录指纹未变时，复用已有 JSON 中未修改源文件的条目，
+        只为新增/变动的源文件重建编译命令。条目以流式方式序列化写入，
+        不在内存中物化完整命令列表。
+        """
         compile_commands_path = self.project_root / "compile_commands.json"
-        
+
+        # 调用方可能传入混合列表，这里只过滤一次 C# 项目
+        cpp_projects = [p for p in projects if not p.is_csharp]
+
+        # 包含目录（或平台）变化会改变所有条目，此时整体重建
+        if fingerprint is None:
+            fingerprint = self._ComputeIncludeFingerprint(cpp_projects)
+        if fingerprint_hit is None:
+            fingerprint_hit = fingerprint == self._LoadCachedFingerprint()
+        existing_commands = {}
+        existing_mtime = 0.0
+        if fingerprint_hit:
+            existing_commands = self._LoadExistingCommands(compile_commands_path)
+            if existing_commands:
+                try:
+                    existing_mtime = compile_commands_path.stat().st_mtime
+                except OSError:
+                    existing_commands = {}
+
         try:
-            with open(compile_commands_path, 'w', encoding='utf-8') as f:
-                json.dump(compile_commands, f, indent=2, ensure_ascii=False)
-            
+            count = self._WriteJsonArrayStream(
+                compile_commands_path,
+                self._IterCompileCommands(
+                    cpp_projects, existing_commands, existing_mtime
+                )
+            )
+
+            self._SaveCachedFingerprint(fingerprint)
             logger.info(f"生成 compile_commands.json: {compile_commands_path}")
-            logger.info(f"包含 {len(compile_commands)} 条编译命令")
+            logger.info(f"包含 {count} 条编译命令")
             return compile_commands_path
-            
+
         except Exception as e:
             logger.error(f"写入 compile_commands.json 失败: {e}")
             return None
-    
-    def GenerateProjectSpecificConfig(self, project: ProjectInfo) -> Path:
-        """为特定项目生成 .clangd 配置"""
-        project_dir = project.path
-        config_path = project_dir / ".clangd"
+
+    def _IterCompileCommands(
+        self,
+        cpp_projects: List[ProjectInfo],
+        existing_commands: Dict[tuple, Dict[str, Any]],
+        existing_mtime: float
+    ):
+        """按项目顺序惰性产出编译命令条目
+
+        每个项目的源文件枚举相互独立，用线程池并行收集，
+        消费端按提交顺序逐项目产出，保持确定性输出。
+        """
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    self.GenerateProjectCompileCommands, project,
+                    existing_commands, existing_mtime
+                )
+                for project in cpp_projects
+            ]
+            for future in futures:
+                yield from future.result()
+
+    def _WriteJsonArrayStream(self, path: Path, entries) -> int:
+        """将条目流式序列化为 JSON 数组写入文件
+
+        逐条目编码并写入带缓冲的临时文件，峰值内存与单个条目成正比；
+        写完后与现有文件做流式比较，内容未变时丢弃临时文件保留 mtime。
+
+        Returns:
+            写入的条目数
+        """
+        tmp_path = path.with_name(path.name + '.tmp')
+        count = 0
+        with open(tmp_path, 'wb', buffering=1024 * 1024) as f:
+            f.write(b'[')
+            for entry in entries:
+                if orjson is not None:
+                    chunk = orjson.dumps(entry, option=orjson.OPT_INDENT_2)
+                else:
+                    chunk = json.dumps(
+                        entry, indent=2, ensure_ascii=False
+                    ).encode('utf-8')
+                prefix = b'\n  ' if count == 0 else b',\n  '
+                f.write(prefix + chunk.replace(b'\n', b'\n  '))
+                count += 1
+            f.write(b'\n]' if count else b']')
+
+        try:
+            unchanged = path.exists() and filecmp.cmp(
+                str(path), str(tmp_path), shallow=False
+            )
+        except OSError:
+            unchanged = False
+
+        if unchanged:
+            os.unlink(tmp_path)
+        else:
+            os.replace(tmp_path, path)
+        return count
+
+    def _ComputeIncludeFingerprint(self, cpp_projects: List[ProjectInfo]) -> str:
+        """计算所有项目包含目录（含平台）的指纹，用于增量缓存失效"""
+        payload = json.dumps(
+            {
+                'version': _CONFIG_FORMAT_VERSION,
+                'platform': platform.system(),
+                'includes': {
+                    p.name: sorted(self.CollectProjectIncludeDirs(p))
+                    for p in cpp_projects
+                },
+            },
+            sort_keys=True,
+        )
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _FingerprintPath(self) -> Path:
+        return self.project_root / ".nutgen-cache" / "compile_commands.fingerprint"
+
+    def _LoadCachedFingerprint(self) -> Optional[str]:
+        try:
+            return self._FingerprintPath().read_text(encoding='utf-8').strip()
+        except OSError:
+            return None
+
+    def _SaveCachedFingerprint(self, fingerprint: str):
+        try:
+            path = self._FingerprintPath()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(fingerprint, encoding='utf-8')
+        except OSError as e:
+            logger.debug(f"写入 compile_commands 指纹失败: {e}")
+
+    @staticmethod
+    def _LoadExistingCommands(path: Path) -> Dict[tuple, Dict[str, Any]]:
+        """读取已有 compile_commands.json，按 (directory, file) 建索引"""
+        try:
+            raw = path.read_bytes()
+            entries = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(entries, list):
+            return {}
+
+        return {
+            (entry.get('directory'), entry.get('file')): entry
+            for entry in entries
+            if isinstance(entry, dict)
+        }
+
+    def _BuildProjectSpecificConfig(self, project: ProjectInfo):
+        """构建项目特定 .clangd 配置（只生成内容，写入由调用方批量完成）
+
+        Returns:
+            (配置文件路径, 配置内容) 元组
+        """
+        config_path = project.path / ".clangd"
         
-        # 收集项目特定的包含目录
-        include_dirs = self.CollectProjectIncludeDirs(project)
+        # 只收集项目特有的包含目录增量，全局部分由参数构建统一附加
+        extra_dirs = self._CollectProjectExtraIncludeDirs(project)
         
         # 生成配置内容
-        config_content = self.BuildClangdConfig(include_dirs, project_specific=True)
-        
+        config_content = self.BuildClangdConfig(extra_dirs, project_specific=True)
+        return config_path, config_content
+
+    @staticmethod
+    def _WriteFileBytes(path: Path, data: bytes) -> bool:
+        """写入文件内容；内容未变化时跳过，避免 mtime 变动触发 clangd 重索引
+
+        Returns:
+            是否实际写入
+        """
         try:
-            with open(config_path, 'w', encoding='utf-8') as f:
-                f.write(config_content)
-            
-            logger.debug(f"生成项目特定 clangd 配置: {config_path}")
-            return config_path
-            
-        except Exception as e:
-            logger.error(f"写入项目 .clangd 配置文件失败: {e}")
-            return None
+            # 大小不同必然内容不同，先用 stat 规避整文件读取
+            if os.stat(path).st_size == len(data) and path.read_bytes() == data:
+                return False
+        except OSError:
+            pass
+
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+        return True
     
     def CollectGlobalIncludeDirs(self) -> Set[str]:
-        """收集全局包含目录"""
+        """收集全局包含目录（结果按实例缓存，全树遍历只做一次）"""
+        if self._global_include_dirs is not None:
+            return self._global_include_dirs
+
         include_dirs = set()
         
         # 添加常用的系统和第三方库目录
@@ -147,37 +377,74 @@ class ClangdGenerator:
             if dir_path.exists():
                 include_dirs.add(str(dir_path))
         
-        # 自动发现所有 Sources 目录
-        sources_dirs = list(self.project_root.rglob("Sources"))
-        for sources_dir in sources_dirs:
-            if sources_dir.is_dir():
-                include_dirs.add(str(sources_dir))
-        
-        # 自动发现所有 include 目录
-        include_dirs_found = list(self.project_root.rglob("include"))
-        for include_dir in include_dirs_found:
-            if include_dir.is_dir():
-                include_dirs.add(str(include_dir))
-        
-        # 自动发现 Intermediate/Generated 下的所有子目录
+        # 单次 os.walk 同时发现 Sources 和 include 目录。
+        # Intermediate/Generated 的布局由本生成器控制
+        # （Generated/<项目相对路径>/Sources），无需递归扫描，
+        # 由 _AddProjectGeneratedDirs 按项目直接探测并入。
         generated_base = self.project_root / "Intermediate" / "Generated"
         if generated_base.exists():
             # 添加 Generated 根目录
             include_dirs.add(str(generated_base))
-            
-            # 递归添加所有子目录，特别是包含生成头文件的目录
-            for generated_dir in generated_base.rglob("*"):
-                if generated_dir.is_dir():
-                    # 检查是否包含 .h 或 .generate.h 文件
-                    has_headers = any(generated_dir.glob("*.h")) or any(generated_dir.glob("*.generate.h"))
-                    if has_headers:
-                        include_dirs.add(str(generated_dir))
-                        logger.debug(f"添加生成头文件目录: {generated_dir}")
-        
+
+        generated_base_str = str(generated_base)
+
+        # 显式栈 + os.scandir 遍历：DirEntry 的 is_dir 复用 readdir
+        # 结果（无额外 stat），且不像 os.walk 那样为每个目录构建
+        # 文件名列表——这里只关心目录
+        stack = [str(self.project_root)]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    name = entry.name
+                    # 跳过隐藏目录和明显的非源码目录
+                    if name[:1] == '.' or name in _WALK_PRUNE_DIRS:
+                        continue
+                    try:
+                        if not entry.is_dir(follow_symlinks=False):
+                            continue
+                    except OSError:
+                        continue
+
+                    entry_path = entry.path
+                    # Generated 树不再递归发现，见上
+                    if entry_path == generated_base_str:
+                        continue
+                    if name in ('Sources', 'include'):
+                        include_dirs.add(entry_path)
+                    stack.append(entry_path)
+
+        self._global_include_dirs = include_dirs
         return include_dirs
+
+    def _AddProjectGeneratedDirs(self, projects: List[ProjectInfo]):
+        """按约定布局将各项目的生成头文件目录并入全局包含集合
+
+        O(P) 次 exists 探测取代对 Generated 树的递归扫描。
+        """
+        include_dirs = self.CollectGlobalIncludeDirs()
+        generated_base = self.project_root / "Intermediate" / "Generated"
+        for project in projects:
+            try:
+                relative_path = project.path.relative_to(self.project_root)
+            except ValueError:
+                continue
+            generated_dir = generated_base / relative_path / "Sources"
+            if generated_dir.exists():
+                include_dirs.add(str(generated_dir))
+                logger.debug(f"添加生成头文件目录: {generated_dir}")
     
     def CollectProjectIncludeDirs(self, project: ProjectInfo) -> Set[str]:
-        """收集项目特定的包含目录"""
+        """收集项目的完整包含目录（项目增量与全局目录的并集）"""
+        include_dirs = self._CollectProjectExtraIncludeDirs(project)
+        include_dirs.update(self.CollectGlobalIncludeDirs())
+        return include_dirs
+
+    def _CollectProjectExtraIncludeDirs(self, project: ProjectInfo) -> Set[str]:
+        """收集项目特定的包含目录增量（不含全局目录）"""
         include_dirs = set()
         
         # 添加项目自己的源目录
@@ -192,97 +459,161 @@ class ClangdGenerator:
             include_dirs.add(str(project_generated_dir))
             logger.debug(f"添加项目 {project.name} 的生成头文件目录: {project_generated_dir}")
         
-        # 添加全局包含目录
-        include_dirs.update(self.CollectGlobalIncludeDirs())
-        
         return include_dirs
     
-    def GenerateProjectCompileCommands(self, project: ProjectInfo) -> List[Dict[str, Any]]:
-        """为项目生成编译命令"""
+    def GenerateProjectCompileCommands(
+        self,
+        project: ProjectInfo,
+        existing_commands: Optional[Dict[tuple, Dict[str, Any]]] = None,
+        existing_mtime: float = 0.0
+    ) -> List[Dict[str, Any]]:
+        """为项目生成编译命令
+
+        Args:
+            project: 项目信息
+            existing_commands: 已有 compile_commands 条目（(directory, file) 索引）
+            existing_mtime: 已有 compile_commands.json 的修改时间，
+                早于该时间的源文件直接复用旧条目
+        """
         commands = []
         
         # 收集项目源文件 - 使用项目文件中的源文件信息
+        # 热路径全程用字符串路径，不构造 Path 对象
         source_files = []
         
         # 从项目的文件列表中获取源文件
         if hasattr(project, 'files'):
-            # project.files is a dict with FileGroup keys and List[FileInfo] values
-            source_file_infos = project.GetSourceFiles()  # This returns List[FileInfo]
-            for file_info in source_file_infos:
-                if file_info.path.suffix in ['.cpp', '.cxx', '.cc', '.c']:
-                    source_files.append(file_info.path)
+            for file_info in project.GetSourceFiles():
+                if os.path.splitext(file_info.path_str)[1] in ('.cpp', '.cxx', '.cc', '.c'):
+                    source_files.append(file_info.path_str)
         
         # 如果没有找到文件，尝试直接搜索 Sources 目录和项目目录
         if not source_files:
-            # 首先尝试 Sources 子目录
+            cpp_extensions = {'.cpp', '.cxx', '.cc', '.c'}
+
+            # 首先尝试 Sources 子目录：单次 os.walk 按扩展名集合过滤，
+            # 取代按扩展名各跑一遍 rglob
             sources_dir = project.path / "Sources"
             if sources_dir.exists():
-                cpp_extensions = ['.cpp', '.cxx', '.cc', '.c']
-                for ext in cpp_extensions:
-                    source_files.extend(sources_dir.rglob(f"*{ext}"))
+                for root, dirs, files in os.walk(str(sources_dir)):
+                    dirs[:] = [
+                        d for d in dirs
+                        if d not in _WALK_PRUNE_DIRS and not d.startswith('.')
+                    ]
+                    source_files.extend(
+                        os.path.join(root, f) for f in files
+                        if os.path.splitext(f)[1] in cpp_extensions
+                    )
             
-            # 如果 Sources 目录不存在，尝试在项目根目录中查找
+            # 如果 Sources 目录不存在，尝试在项目根目录中查找（不递归）
             if not source_files:
-                project_dir = project.path
-                cpp_extensions = ['.cpp', '.cxx', '.cc', '.c']
-                for ext in cpp_extensions:
-                    source_files.extend(project_dir.glob(f"*{ext}"))
+                try:
+                    with os.scandir(project.path) as entries:
+                        source_files.extend(
+                            entry.path for entry in entries
+                            if entry.is_file()
+                            and os.path.splitext(entry.name)[1] in cpp_extensions
+                        )
+                except OSError:
+                    pass
         
         logger.debug(f"项目 {project.name} 找到 {len(source_files)} 个源文件")
         
         if not source_files:
             return commands
         
-        # 收集包含目录
-        include_dirs = self.CollectProjectIncludeDirs(project)
-        
-        # 构建编译器参数
-        compiler_args = self.BuildCompilerArgs(include_dirs)
+        # 构建编译器参数（只传项目特有的包含目录增量）
+        compiler_args = self.BuildCompilerArgs(
+            self._CollectProjectExtraIncludeDirs(project)
+        )
         
-        # 为每个源文件生成编译命令
-        for source_file in source_files:
+        # 命令前缀和参数元组在项目内不变，循环外构建一次，
+        # 每条命令只追加各自的源文件路径
+        directory = str(self.project_root)
+        command_prefix = f"clang++ {' '.join(compiler_args)} -c "
+        base_args = ("clang++", *compiler_args, "-c")
+
+        # 为每个源文件生成编译命令；未修改的源文件复用旧条目
+        for src_str in source_files:
+            if existing_commands:
+                existing = existing_commands.get((directory, src_str))
+                if existing is not None:
+                    try:
+                        unchanged = os.stat(src_str).st_mtime <= existing_mtime
+                    except OSError:
+                        unchanged = False
+                    if unchanged:
+                        commands.append(existing)
+                        continue
+
             command = {
-                "directory": str(self.project_root),
-                "file": str(source_file),
-                "command": f"clang++ {' '.join(compiler_args)} -c {source_file}",
-                "arguments": ["clang++"] + compiler_args + ["-c", str(source_file)]
+                "directory": directory,
+                "file": src_str,
+                "command": command_prefix + src_str,
+                "arguments": [*base_args, src_str]
             }
             commands.append(command)
         
         return commands
     
-    def BuildCompilerArgs(self, include_dirs: Set[str]) -> List[str]:
-        """构建编译器参数"""
-        args = []
-        
-        # C++ 标准
-        args.extend(["-std=c++20"])
-        
-        # 编译器警告
-        args.extend(["-Wall", "-Wextra"])
-        
-        # 调试信息
-        args.extend(["-g", "-O0"])
-        
-        # 定义宏
-        args.extend(["-DDEBUG"])
-        
-        # 平台特定设置
-        import platform
-        if platform.system() == "Darwin":
-            args.extend(["-mmacosx-version-min=10.15"])
-        
-        # 包含目录
-        for include_dir in sorted(include_dirs):
-            args.extend(["-I", include_dir])
-        
+    def _GetBaseArgs(self) -> tuple:
+        """构建与包含目录无关的基础编译参数（按实例缓存）"""
+        if self._base_args is None:
+            args = []
+
+            # C++ 标准
+            args.extend(["-std=c++20"])
+
+            # 编译器警告
+            args.extend(["-Wall", "-Wextra"])
+
+            # 调试信息
+            args.extend(["-g", "-O0"])
+
+            # 定义宏
+            args.extend(["-DDEBUG"])
+
+            # 平台特定设置
+            if _IS_DARWIN:
+                args.extend(["-mmacosx-version-min=10.15"])
+
+            self._base_args = tuple(args)
+        return self._base_args
+
+    def _GetGlobalIncludeFlags(self) -> tuple:
+        """全局包含目录的 -I 参数序列（排序一次，所有项目共享同一元组）"""
+        if self._global_include_flags is None:
+            flags = []
+            for include_dir in sorted(self.CollectGlobalIncludeDirs()):
+                flags.extend(("-I", include_dir))
+            self._global_include_flags = tuple(flags)
+        return self._global_include_flags
+
+    def BuildCompilerArgs(self, extra_include_dirs: Set[str]) -> List[str]:
+        """构建编译器参数
+
+        参数 = 基础参数 + 全局 -I 前缀 + 项目特有目录的 -I。
+        全局前缀只排序拼装一次；项目特有部分通常为空
+        （Sources 和生成目录已在全局集合里），全项目共享同一参数列表。
+        """
+        # 去掉已包含在全局前缀里的目录，只为真正的增量排序
+        extra_key = frozenset(extra_include_dirs) - self.CollectGlobalIncludeDirs()
+        cached = self._compiler_args_cache.get(extra_key)
+        if cached is not None:
+            return cached
+
+        args = [*self._GetBaseArgs(), *self._GetGlobalIncludeFlags()]
+        for include_dir in sorted(extra_key):
+            args.extend(("-I", include_dir))
+
+        self._compiler_args_cache[extra_key] = args
         return args
     
-    def BuildClangdConfig(self, include_dirs: Set[str], project_specific: bool = False) -> str:
+    def BuildClangdConfig(self, extra_include_dirs: Set[str], project_specific: bool = False) -> str:
         """构建 .clangd 配置文件内容"""
         
         # 构建编译器参数
-        compiler_args = self.BuildCompilerArgs(include_dirs)
+        compiler_args = self.BuildCompilerArgs(extra_include_dirs)
         
         config = {
             "CompileFlags": {
@@ -324,20 +655,26 @@ class ClangdGenerator:
                 }
             }
         
-        # 转换为 YAML 格式
-        yaml_content = self.DictToYaml(config)
-        
+        # 转换为 YAML 格式（优先 libyaml C 扩展序列化，保持键序；
+        # PyYAML 未安装时退回手写转换，两者解析为同一文档）
+        if yaml is not None:
+            yaml_content = yaml.dump(
+                config, Dumper=_YAML_DUMPER,
+                sort_keys=False, default_flow_style=False, allow_unicode=True
+            )
+        else:
+            yaml_content = self.DictToYaml(config) + "\n"
+
         return f"""# clangd 配置文件
 # 由 Nut 项目生成器自动生成 - 请勿手动修改
 
-{yaml_content}
-"""
-    
+{yaml_content}"""
+
     def DictToYaml(self, data: Any, indent: int = 0) -> str:
-        """简单的字典到 YAML 转换"""
+        """简单的字典到 YAML 转换（PyYAML 不可用时的回退路径）"""
         lines = []
         indent_str = "  " * indent
-        
+
         if isinstance(data, dict):
             for key, value in data.items():
                 if isinstance(value, (dict, list)):
@@ -352,9 +689,9 @@ class ClangdGenerator:
                     lines.append(self.DictToYaml(item, indent + 1))
                 else:
                     lines.append(f"{indent_str}- {self.FormatYamlValue(item)}")
-        
+
         return "\n".join(lines)
-    
+
     def FormatYamlValue(self, value: Any) -> str:
         """格式化 YAML 值"""
         if isinstance(value, bool):
@@ -365,4 +702,4 @@ class ClangdGenerator:
                 return f'"{value}"'
             return value
         else:
-            return str(value)
\ No newline at end of file
+            return str(value)
@@ -4,19 +4,203 @@ Visual Studio 项目生成器
 生成 Visual Studio 项目文件 (.vcxproj)
 """
 
+import io
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import List
 
-from Tools.ProjectGenerator.generators.base_generator import BaseGenerator
+from Tools.ProjectGenerator.generators.base_generator import BaseGenerator, EscapeXmlName
 from Tools.ProjectGenerator.core.project_info import ProjectInfo, FileGroup, ProjectType
 
 
 logger = logging.getLogger(__name__)
 
 
+# NutBuild 预构建命令模板：单个三引号字面量在模块导入时一次建成，
+# 仅项目名和配置占位；相同 (项目名, 配置) 的结果由 lru_cache 复用
+_NUT_BUILD_CMD_TEMPLATE = """@echo off
+echo === NutBuildTools PreBuild ===
+
+rem Find project root by looking for CLAUDE.md
+set PROJECT_ROOT=$(MSBuildProjectDirectory)
+:FIND_ROOT
+if exist "%PROJECT_ROOT%\\CLAUDE.md" goto FOUND_ROOT
+for %%I in ("%PROJECT_ROOT%") do set PROJECT_ROOT=%%~dpI
+set PROJECT_ROOT=%PROJECT_ROOT:~0,-1%
+if "%PROJECT_ROOT%"=="%PROJECT_ROOT:~0,3%" (
+    echo Error: Could not find project root
+    exit /b 1
+)
+goto FIND_ROOT
+:FOUND_ROOT
+
+rem Change to project root
+cd /d "%PROJECT_ROOT%" 2>nul || (
+    echo Error: Cannot change to project root
+    exit /b 1
+)
+
+rem Use the DLL directly like nutbuild.bat does
+set NUTBUILDTOOLS_DLL=%PROJECT_ROOT%\\Binary\\NutBuildTools\\NutBuildTools.dll
+
+rem Build NutBuildTools if DLL not found
+if not exist "%NUTBUILDTOOLS_DLL%" (
+    echo Building NutBuildTools...
+    dotnet build Source\\Programs\\NutBuildTools -c Release --output Binary\\NutBuildTools 2>nul || (
+        echo Warning: Failed to build NutBuildTools, trying without output redirect
+        dotnet build Source\\Programs\\NutBuildTools -c Release --output Binary\\NutBuildTools
+    )
+)
+
+rem Check if DLL exists now
+if not exist "%NUTBUILDTOOLS_DLL%" (
+    echo Warning: NutBuildTools.dll not found, PreBuild will be skipped
+    exit /b 0
+)
+
+rem Run NutBuildTools with simple approach
+echo Running NutBuildTools for {name}...
+dotnet "%NUTBUILDTOOLS_DLL%" --target {name} --platform Windows --configuration {configuration} || (
+    echo Warning: NutBuildTools completed with warnings
+)
+echo PreBuild completed
+exit /b 0"""
+
+
+@lru_cache(maxsize=None)
+def _BuildNutBuildCommand(name: str, configuration: str) -> str:
+    """按 (项目名, 配置) 填充并缓存 NutBuild 命令"""
+    return _NUT_BUILD_CMD_TEMPLATE.format(name=name, configuration=configuration)
+
+
+# 完全不变的 XML 模板块：模块导入时构建一次，逐项目只做一次 write
+_PROJECT_CONFIGURATIONS_XML = (
+    '  <ItemGroup Label="ProjectConfigurations">\n'
+    '    <ProjectConfiguration Include="Debug|x64">\n'
+    '      <Configuration>Debug</Configuration>\n'
+    '      <Platform>x64</Platform>\n'
+    '    </ProjectConfiguration>\n'
+    '    <ProjectConfiguration Include="Release|x64">\n'
+    '      <Configuration>Release</Configuration>\n'
+    '      <Platform>x64</Platform>\n'
+    '    </ProjectConfiguration>\n'
+    '  </ItemGroup>\n'
+)
+
+_CONFIGURATION_PROPERTIES_XML = (
+    '  <PropertyGroup Condition="\'$(Configuration)|$(Platform)\'==\'Debug|x64\'" Label="Configuration">\n'
+    '    <ConfigurationType>Utility</ConfigurationType>\n'
+    '    <UseDebugLibraries>true</UseDebugLibraries>\n'
+    '    <PlatformToolset>v143</PlatformToolset>\n'
+    '    <CharacterSet>Unicode</CharacterSet>\n'
+    '  </PropertyGroup>\n'
+    '  <PropertyGroup Condition="\'$(Configuration)|$(Platform)\'==\'Release|x64\'" Label="Configuration">\n'
+    '    <ConfigurationType>Utility</ConfigurationType>\n'
+    '    <UseDebugLibraries>false</UseDebugLibraries>\n'
+    '    <PlatformToolset>v143</PlatformToolset>\n'
+    '    <WholeProgramOptimization>true</WholeProgramOptimization>\n'
+    '    <CharacterSet>Unicode</CharacterSet>\n'
+    '  </PropertyGroup>\n'
+)
+
+_PROPERTY_SHEETS_XML = ''.join(
+    f'  <ImportGroup Label="PropertySheets" Condition="\'$(Configuration)|$(Platform)\'==\'{config}|x64\'">\n'
+    '    <Import Project="$(UserRootDir)\\Microsoft.Cpp.$(Platform).user.props" Condition="exists(\'$(UserRootDir)\\Microsoft.Cpp.$(Platform).user.props\')" Label="LocalAppDataPlatform" />\n'
+    '  </ImportGroup>\n'
+    for config in ('Debug', 'Release')
+)
+
+_PROPERTIES_XML = '''  <PropertyGroup Condition="'$(Configuration)|$(Platform)'=='Debug|x64'">
+    <LinkIncremental>true</LinkIncremental>
+    <IntDir>$(SolutionDir)Intermediate\\$(Configuration)\\$(ProjectName)\\</IntDir>
+    <OutDir>$(SolutionDir)Binary\\</OutDir>
+    <IncludePath>$(ProjectDir)../../ThirdParty/spdlog/include;$(ProjectDir)../../ThirdParty/tcmalloc/src;$(ProjectDir)../../Source;$(IncludePath)</IncludePath>
+  </PropertyGroup>
+  <PropertyGroup Condition="'$(Configuration)|$(Platform)'=='Release|x64'">
+    <LinkIncremental>false</LinkIncremental>
+    <IntDir>$(SolutionDir)Intermediate\\$(Configuration)\\$(ProjectName)\\</IntDir>
+    <OutDir>$(SolutionDir)Binary\\</OutDir>
+    <IncludePath>$(ProjectDir)../../ThirdParty/spdlog/include;$(ProjectDir)../../ThirdParty/tcmalloc/src;$(ProjectDir)../../Source;$(IncludePath)</IncludePath>
+  </PropertyGroup>
+'''
+
+# XML 属性值转义表：str.translate 单次 C 层扫描完成全部替换，
+# 比逐个 .replace 或 saxutils.escape 更快
+_XML_ATTR_ESCAPE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+})
+
+# 逐文件条目模板：% 格式化单次替换比每轮迭代重建 f-string 便宜
+_FILE_ITEM_TEMPLATE = '<None Include="%s" />'
+_FILTER_ITEM_TEMPLATE = (
+    '    <None Include="%s">\n'
+    '      <Filter>%s</Filter>\n'
+    '    </None>'
+)
+
+# 每配置的 ItemDefinitionGroup 块：仅 CDATA 内的 NutBuild 命令占位，
+# 单次 % 替换取代逐行拼接
+_ITEMDEF_DEBUG_TMPL = (
+    '  <ItemDefinitionGroup Condition="\'$(Configuration)|$(Platform)\'==\'Debug|x64\'">\n'
+    '    <PreBuildEvent>\n'
+    '      <Command>\n'
+    '<![CDATA[%s]]>\n'
+    '      </Command>\n'
+    '      <Message>Running NutBuildTools...</Message>\n'
+    '    </PreBuildEvent>\n'
+    '  </ItemDefinitionGroup>\n'
+)
+_ITEMDEF_RELEASE_TMPL = _ITEMDEF_DEBUG_TMPL.replace('Debug|x64', 'Release|x64')
+
+# Windows 上 relpath 已用反斜杠分隔，无需再做替换
+_PATH_SEP_IS_BACKSLASH = (os.sep == '\\')
+
+_FILTERS_HEADER_XML = (
+    '<?xml version="1.0" encoding="utf-8"?>\n'
+    '<Project ToolsVersion="4.0" xmlns="http://schemas.microsoft.com/developer/msbuild/2003">\n'
+    '  <ItemGroup>\n'
+    '    <Filter Include="Headers">\n'
+    '      <UniqueIdentifier>{93995380-89BD-4b04-88EB-625FBE52EBFB}</UniqueIdentifier>\n'
+    '      <Extensions>h;hh;hpp;hxx;h++;hm;inl;inc;ipp;xsd</Extensions>\n'
+    '    </Filter>\n'
+    '    <Filter Include="Sources">\n'
+    '      <UniqueIdentifier>{4FC737F1-C7A5-4376-A066-2A32D752A2FF}</UniqueIdentifier>\n'
+    '      <Extensions>cpp;c;cc;cxx;c++;cppm;ixx;def;odl;idl;hpj;bat;asm;asmx</Extensions>\n'
+    '    </Filter>\n'
+    '    <Filter Include="Configs">\n'
+    '      <UniqueIdentifier>{67DA6AB6-F800-4c08-8B7A-83BB121AAD01}</UniqueIdentifier>\n'
+    '      <Extensions>rc;ico;cur;bmp;dlg;rc2;rct;bin;rgs;gif;jpg;jpeg;jpe;resx;tiff;tif;png;wav;mfcribbon-ms</Extensions>\n'
+    '    </Filter>\n'
+    '    <Filter Include="Meta">\n'
+    '      <UniqueIdentifier>{50E4BC84-97C0-4d2e-A7E7-F3D35DB497D0}</UniqueIdentifier>\n'
+    '    </Filter>\n'
+    '  </ItemGroup>\n'
+)
+
+
 class VcxprojGenerator(BaseGenerator):
     """Visual Studio 项目生成器"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # 相对路径计算结果缓存：(目标路径, 基准路径) -> 相对路径字符串
+        self._relpath_cache = {}
+        # 项目名到 GUID 的缓存，避免重复生成时反复哈希同一名字
+        self._guid_cache = {}
+        # vcxproj 与 filters 两路写盘共用的双工线程池，
+        # 写入释放 GIL，两个独立文件的落盘可以重叠
+        self._write_pool = ThreadPoolExecutor(max_workers=2)
+    
+    @classmethod
+    def ShouldGenerate(cls, project_info: ProjectInfo) -> bool:
+        """C# 项目已有 .csproj，无需生成 vcxproj"""
+        return not project_info.is_csharp
     
     @property
     def FileExtension(self) -> str:
@@ -36,374 +220,236 @@ class VcxprojGenerator(BaseGenerator):
         projects_dir = self.project_root / "ProjectFiles" / project_info.group_name
         project_file = projects_dir / f"{project_info.name}.vcxproj"
         filters_file = projects_dir / f"{project_info.name}.vcxproj.filters"
+
+        # 增量生成交给 _WriteProjectFile 的内容比对：mtime 快速检查
+        # 看不到被删除的文件（文件集缩小不会推进任何 mtime），
+        # 内容比对则对增删改一律正确，且未变化时同样不触碰磁盘
         self._EnsureOutputDirectory(project_file)
         
-        # 生成项目内容
-        content = self._GenerateVcxprojContent(project_info, project_file)
-        filters_content = self._GenerateFiltersContent(project_info, project_file)
+        # 各分组文件的相对路径只算一次，vcxproj 与 filters 两路生成共用
+        rel_bundle = (
+            self._RelativePathsFor(project_info.GetSourceFiles(), projects_dir),
+            self._RelativePathsFor(project_info.GetHeaderFiles(), projects_dir),
+            self._RelativePathsFor(project_info.GetFiles(FileGroup.CONFIGS), projects_dir),
+            self._RelativePathsFor(project_info.GetFiles(FileGroup.META), projects_dir),
+        )
         
-        # 写入文件
-        project_file.write_text(content, encoding='utf-8')
-        filters_file.write_text(filters_content, encoding='utf-8')
+        # 生成项目内容
+        content = self._GenerateVcxprojContent(project_info, rel_bundle)
+        filters_content = self._GenerateFiltersContent(rel_bundle)
+        
+        # 写入文件：两个输出互相独立且以 I/O 为主，
+        # 提交到共享线程池并行落盘
+        futures = (
+            self._write_pool.submit(self._WriteProjectFile, project_file, content),
+            self._write_pool.submit(self._WriteProjectFile, filters_file, filters_content),
+        )
+        for future in futures:
+            future.result()
         
         logger.info(f"生成 Visual Studio 项目: {project_file}")
         logger.info(f"生成 Visual Studio 过滤器: {filters_file}")
         return project_file
     
-    def _GenerateVcxprojContent(self, project_info: ProjectInfo, project_file: Path) -> str:
-        """生成 vcxproj 文件内容"""
-        lines = []
+    @staticmethod
+    def _WriteProjectFile(path: Path, content: str):
+        """编码为 UTF-8 字节后经 os.write 单次落盘
+
+        绕过 TextIOWrapper 的分块编码/换行转换和 BufferedWriter
+        的缓冲管理，每个文件只有一次 write 系统调用。
+        """
+        data = content.encode('utf-8')
+
+        # 内容与磁盘上完全一致时跳过写入：mtime 不变，
+        # Visual Studio 不会触发项目重新加载。
+        # 先比大小（纯 stat）再比内容，多数不一致在 stat 就能判掉
+        try:
+            if os.stat(path).st_size == len(data) and path.read_bytes() == data:
+                return
+        except OSError:
+            pass
+
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+    
+    def _RelativePathsFor(self, columns, base_dir: Path) -> List[str]:
+        """计算一个分组内所有文件相对输出目录的（已转义）路径"""
+        paths = columns.paths if columns else ()
+        return [self._GetRelativePath(path_str, base_dir) for path_str in paths]
+    
+    def _GenerateVcxprojContent(self, project_info: ProjectInfo, rel_bundle) -> str:
+        """生成 vcxproj 文件内容
+
+        用 io.StringIO 累积输出：C 层连续缓冲写入，
+        省去小字符串列表和最后一次 O(n) join 拷贝。
+        """
+        buf = io.StringIO()
         
         # XML 头和项目开始
-        lines.extend([
-            '<?xml version="1.0" encoding="utf-8"?>',
-            '<Project DefaultTargets="Build" xmlns="http://schemas.microsoft.com/developer/msbuild/2003">'
-        ])
+        buf.write('<?xml version="1.0" encoding="utf-8"?>\n'
+                  '<Project DefaultTargets="Build" xmlns="http://schemas.microsoft.com/developer/msbuild/2003">\n')
         
         # 项目配置
-        self._AddProjectConfigurations(lines)
+        self._AddProjectConfigurations(buf)
         
         # 全局属性
-        self._AddGlobalProperties(lines, project_info)
+        self._AddGlobalProperties(buf, project_info)
         
         # 导入默认属性
-        lines.append('  <Import Project="$(VCTargetsPath)\\Microsoft.Cpp.Default.props" />')
+        buf.write('  <Import Project="$(VCTargetsPath)\\Microsoft.Cpp.Default.props" />\n')
         
         # 配置属性
-        self._AddConfigurationProperties(lines, project_info)
+        self._AddConfigurationProperties(buf, project_info)
         
         # 导入 C++ 属性
-        lines.append('  <Import Project="$(VCTargetsPath)\\Microsoft.Cpp.props" />')
+        buf.write('  <Import Project="$(VCTargetsPath)\\Microsoft.Cpp.props" />\n')
         
         # 扩展设置
-        lines.extend([
-            '  <ImportGroup Label="ExtensionSettings">',
-            '  </ImportGroup>',
-            '  <ImportGroup Label="Shared">',
-            '  </ImportGroup>'
-        ])
+        buf.write('  <ImportGroup Label="ExtensionSettings">\n'
+                  '  </ImportGroup>\n'
+                  '  <ImportGroup Label="Shared">\n'
+                  '  </ImportGroup>\n')
         
         # 属性表
-        self._AddPropertySheets(lines)
+        self._AddPropertySheets(buf)
         
         # 用户宏
-        lines.append('  <PropertyGroup Label="UserMacros" />')
+        buf.write('  <PropertyGroup Label="UserMacros" />\n')
         
         # 属性
-        self._AddProperties(lines)
+        self._AddProperties(buf)
         
         # 项目定义组
-        self._AddItemDefinitionGroups(lines, project_info)
+        self._AddItemDefinitionGroups(buf, project_info)
         
         # 文件项目组
-        self._AddFileItemGroups(lines, project_info, project_file)
+        self._AddFileItemGroups(buf, rel_bundle)
         
         # 导入 C++ targets
-        lines.append('  <Import Project="$(VCTargetsPath)\\Microsoft.Cpp.targets" />')
-        
-        # 扩展 targets
-        lines.extend([
-            '  <ImportGroup Label="ExtensionTargets">',
-            '  </ImportGroup>'
-        ])
+        buf.write('  <Import Project="$(VCTargetsPath)\\Microsoft.Cpp.targets" />\n')
         
-        # 项目结束
-        lines.append('</Project>')
+        # 扩展 targets 和项目结束（最后一行不带换行，保持输出与 join 版本一致）
+        buf.write('  <ImportGroup Label="ExtensionTargets">\n'
+                  '  </ImportGroup>\n'
+                  '</Project>')
         
-        return '\n'.join(lines)
+        return buf.getvalue()
     
-    def _AddProjectConfigurations(self, lines: List[str]):
+    def _AddProjectConfigurations(self, buf: io.StringIO):
         """添加项目配置"""
-        lines.extend([
-            '  <ItemGroup Label="ProjectConfigurations">',
-            '    <ProjectConfiguration Include="Debug|x64">',
-            '      <Configuration>Debug</Configuration>',
-            '      <Platform>x64</Platform>',
-            '    </ProjectConfiguration>',
-            '    <ProjectConfiguration Include="Release|x64">',
-            '      <Configuration>Release</Configuration>',
-            '      <Platform>x64</Platform>',
-            '    </ProjectConfiguration>',
-            '  </ItemGroup>'
-        ])
+        buf.write(_PROJECT_CONFIGURATIONS_XML)
     
-    def _AddGlobalProperties(self, lines: List[str], project_info: ProjectInfo):
+    def _AddGlobalProperties(self, buf: io.StringIO, project_info: ProjectInfo):
         """添加全局属性"""
-        project_guid = self.uuid_generator.GenerateGuid(project_info.name)
-        
-        lines.extend([
-            '  <PropertyGroup Label="Globals">',
-            '    <VCProjectVersion>16.0</VCProjectVersion>',
-            '    <Keyword>Win32Proj</Keyword>',
-            f'    <ProjectGuid>{project_guid}</ProjectGuid>',
-            f'    <RootNamespace>{project_info.name}</RootNamespace>',
-            '    <WindowsTargetPlatformVersion>10.0</WindowsTargetPlatformVersion>',
-            '  </PropertyGroup>'
-        ])
+        project_guid = self._guid_cache.get(project_info.name)
+        if project_guid is None:
+            project_guid = self.uuid_generator.GenerateGuid(project_info.name)
+            self._guid_cache[project_info.name] = project_guid
+        
+        buf.write('  <PropertyGroup Label="Globals">\n'
+                  '    <VCProjectVersion>16.0</VCProjectVersion>\n'
+                  '    <Keyword>Win32Proj</Keyword>\n'
+                  f'    <ProjectGuid>{project_guid}</ProjectGuid>\n'
+                  f'    <RootNamespace>{EscapeXmlName(project_info.name)}</RootNamespace>\n'
+                  '    <WindowsTargetPlatformVersion>10.0</WindowsTargetPlatformVersion>\n'
+                  '  </PropertyGroup>\n')
     
-    def _AddConfigurationProperties(self, lines: List[str], project_info: ProjectInfo):
+    def _AddConfigurationProperties(self, buf: io.StringIO, project_info: ProjectInfo):
         """添加配置属性"""
         # 使用 Utility 类型，这样只会执行构建事件，不会进行实际编译
-        
-        # Debug 配置
-        lines.extend([
-            '  <PropertyGroup Condition="\'$(Configuration)|$(Platform)\'==\'Debug|x64\'" Label="Configuration">',
-            '    <ConfigurationType>Utility</ConfigurationType>',
-            '    <UseDebugLibraries>true</UseDebugLibraries>',
-            '    <PlatformToolset>v143</PlatformToolset>',
-            '    <CharacterSet>Unicode</CharacterSet>',
-            '  </PropertyGroup>'
-        ])
-        
-        # Release 配置
-        lines.extend([
-            '  <PropertyGroup Condition="\'$(Configuration)|$(Platform)\'==\'Release|x64\'" Label="Configuration">',
-            '    <ConfigurationType>Utility</ConfigurationType>',
-            '    <UseDebugLibraries>false</UseDebugLibraries>',
-            '    <PlatformToolset>v143</PlatformToolset>',
-            '    <WholeProgramOptimization>true</WholeProgramOptimization>',
-            '    <CharacterSet>Unicode</CharacterSet>',
-            '  </PropertyGroup>'
-        ])
+        buf.write(_CONFIGURATION_PROPERTIES_XML)
     
-    def _AddPropertySheets(self, lines: List[str]):
+    def _AddPropertySheets(self, buf: io.StringIO):
         """添加属性表"""
-        for config in ['Debug', 'Release']:
-            lines.extend([
-                f'  <ImportGroup Label="PropertySheets" Condition="\'$(Configuration)|$(Platform)\'==\'{config}|x64\'">',
-                '    <Import Project="$(UserRootDir)\\Microsoft.Cpp.$(Platform).user.props" Condition="exists(\'$(UserRootDir)\\Microsoft.Cpp.$(Platform).user.props\')" Label="LocalAppDataPlatform" />',
-                '  </ImportGroup>'
-            ])
+        buf.write(_PROPERTY_SHEETS_XML)
     
-    def _AddProperties(self, lines: List[str]):
+    def _AddProperties(self, buf: io.StringIO):
         """添加属性"""
-        lines.extend([
-            '  <PropertyGroup Condition="\'$(Configuration)|$(Platform)\'==\'Debug|x64\'">',
-            '    <LinkIncremental>true</LinkIncremental>',
-            '    <IntDir>$(SolutionDir)Intermediate\\$(Configuration)\\$(ProjectName)\\</IntDir>',
-            '    <OutDir>$(SolutionDir)Binary\\</OutDir>',
-            '    <IncludePath>$(ProjectDir)../../ThirdParty/spdlog/include;$(ProjectDir)../../ThirdParty/tcmalloc/src;$(ProjectDir)../../Source;$(IncludePath)</IncludePath>',
-            '  </PropertyGroup>',
-            '  <PropertyGroup Condition="\'$(Configuration)|$(Platform)\'==\'Release|x64\'">',
-            '    <LinkIncremental>false</LinkIncremental>',
-            '    <IntDir>$(SolutionDir)Intermediate\\$(Configuration)\\$(ProjectName)\\</IntDir>',
-            '    <OutDir>$(SolutionDir)Binary\\</OutDir>',
-            '    <IncludePath>$(ProjectDir)../../ThirdParty/spdlog/include;$(ProjectDir)../../ThirdParty/tcmalloc/src;$(ProjectDir)../../Source;$(IncludePath)</IncludePath>',
-            '  </PropertyGroup>'
-        ])
+        buf.write(_PROPERTIES_XML)
     
-    def _AddItemDefinitionGroups(self, lines: List[str], project_info: ProjectInfo):
-        """添加项目定义组"""
-        # Debug 配置 - 只包含构建事件，不包含编译设置
-        lines.extend([
-            '  <ItemDefinitionGroup Condition="\'$(Configuration)|$(Platform)\'==\'Debug|x64\'">',
-            '    <PreBuildEvent>',
-            '      <Command>',
-            f'<![CDATA[{self._GenerateNutBuildCommand(project_info, "Debug")}]]>',
-            '      </Command>',
-            '      <Message>Running NutBuildTools...</Message>',
-            '    </PreBuildEvent>',
-            '  </ItemDefinitionGroup>'
-        ])
-        
-        # Release 配置 - 只包含构建事件，不包含编译设置
-        lines.extend([
-            '  <ItemDefinitionGroup Condition="\'$(Configuration)|$(Platform)\'==\'Release|x64\'">',
-            '    <PreBuildEvent>',
-            '      <Command>',
-            f'<![CDATA[{self._GenerateNutBuildCommand(project_info, "Release")}]]>',
-            '      </Command>',
-            '      <Message>Running NutBuildTools...</Message>',
-            '    </PreBuildEvent>',
-            '  </ItemDefinitionGroup>'
-        ])
+    def _AddItemDefinitionGroups(self, buf: io.StringIO, project_info: ProjectInfo):
+        """添加项目定义组（只包含构建事件，不包含编译设置）"""
+        buf.write(_ITEMDEF_DEBUG_TMPL % self._GenerateNutBuildCommand(project_info, "Debug"))
+        buf.write(_ITEMDEF_RELEASE_TMPL % self._GenerateNutBuildCommand(project_info, "Release"))
     
     def _GenerateNutBuildCommand(self, project_info: ProjectInfo, configuration: str) -> str:
         """生成NutBuild命令（简化的Windows批处理版本）"""
-        command_lines = [
-            '@echo off',
-            'echo === NutBuildTools PreBuild ===',
-            '',
-            'rem Find project root by looking for CLAUDE.md',
-            'set PROJECT_ROOT=$(MSBuildProjectDirectory)',
-            ':FIND_ROOT',
-            'if exist "%PROJECT_ROOT%\\CLAUDE.md" goto FOUND_ROOT',
-            'for %%I in ("%PROJECT_ROOT%") do set PROJECT_ROOT=%%~dpI',
-            'set PROJECT_ROOT=%PROJECT_ROOT:~0,-1%',
-            'if "%PROJECT_ROOT%"=="%PROJECT_ROOT:~0,3%" (',
-            '    echo Error: Could not find project root',
-            '    exit /b 1',
-            ')',
-            'goto FIND_ROOT',
-            ':FOUND_ROOT',
-            '',
-            'rem Change to project root',
-            'cd /d "%PROJECT_ROOT%" 2>nul || (',
-            '    echo Error: Cannot change to project root',
-            '    exit /b 1',
-            ')',
-            '',
-            'rem Use the DLL directly like nutbuild.bat does',
-            'set NUTBUILDTOOLS_DLL=%PROJECT_ROOT%\\Binary\\NutBuildTools\\NutBuildTools.dll',
-            '',
-            'rem Build NutBuildTools if DLL not found',
-            'if not exist "%NUTBUILDTOOLS_DLL%" (',
-            '    echo Building NutBuildTools...',
-            '    dotnet build Source\\Programs\\NutBuildTools -c Release --output Binary\\NutBuildTools 2>nul || (',
-            '        echo Warning: Failed to build NutBuildTools, trying without output redirect',
-            '        dotnet build Source\\Programs\\NutBuildTools -c Release --output Binary\\NutBuildTools',
-            '    )',
-            ')',
-            '',
-            'rem Check if DLL exists now',
-            'if not exist "%NUTBUILDTOOLS_DLL%" (',
-            '    echo Warning: NutBuildTools.dll not found, PreBuild will be skipped',
-            '    exit /b 0',
-            ')',
-            '',
-            'rem Run NutBuildTools with simple approach',
-            f'echo Running NutBuildTools for {project_info.name}...',
-            f'dotnet "%NUTBUILDTOOLS_DLL%" --target {project_info.name} --platform Windows --configuration {configuration} || (',
-            '    echo Warning: NutBuildTools completed with warnings',
-            ')',
-            'echo PreBuild completed',
-            'exit /b 0'
-        ]
-        return '\n'.join(command_lines)
+        return _BuildNutBuildCommand(project_info.name, configuration)
     
     def _GetRelativePath(self, target_path: Path, base_path: Path) -> str:
-        """获取相对路径（Visual Studio 特定版本）"""
-        try:
-            # 确保都是绝对路径
-            target_path = target_path.resolve()
-            base_path = base_path.resolve()
-            
-            # 计算相对路径
-            relative_path = target_path.relative_to(base_path)
-            return str(relative_path).replace('/', '\\')
-        except ValueError:
-            # 如果无法计算直接相对路径，尝试通过公共祖先计算
-            try:
-                # 寻找公共祖先
-                common_parts = []
-                target_parts = target_path.parts
-                base_parts = base_path.parts
-                
-                for i, (t_part, b_part) in enumerate(zip(target_parts, base_parts)):
-                    if t_part == b_part:
-                        common_parts.append(t_part)
-                    else:
-                        break
-                
-                if common_parts:
-                    # 计算需要返回的层数
-                    back_count = len(base_parts) - len(common_parts)
-                    forward_parts = target_parts[len(common_parts):]
-                    
-                    # 构建相对路径
-                    relative_parts = ['..'] * back_count + list(forward_parts)
-                    return '\\'.join(relative_parts)
-                else:
-                    # 没有公共祖先，返回绝对路径
-                    return str(target_path)
-            except:
-                return str(target_path)
-
-    def _AddFileItemGroups(self, lines: List[str], project_info: ProjectInfo, project_file: Path):
+        """获取相对路径（Visual Studio 特定版本）
+
+        每个文件在 vcxproj 和 filters 生成中各计算一次，
+        按 (目标, 基准) 缓存结果并复用基准目录的 resolve。
+        """
+        cache_key = (str(target_path), str(base_path))
+        cached = self._relpath_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        result = self._ComputeRelativePath(target_path, base_path)
+        self._relpath_cache[cache_key] = result
+        return result
+
+    @staticmethod
+    def _ComputeRelativePath(target_path: Path, base_path: Path) -> str:
+        """实际的相对路径计算（缓存未命中时调用）
+
+        os.path.relpath 纯字符串计算（含 .. 回退和无公共祖先的情况），
+        不触发任何 stat 调用，取代 resolve + relative_to 加手写回退。
+        结果直接作为 XML 属性值使用，顺带做属性转义（路径中含
+        &、<、>、" 时不再破坏 XML），转义结果随相对路径一起缓存。
+        """
+        relative = os.path.relpath(os.fspath(target_path), os.fspath(base_path))
+        if not _PATH_SEP_IS_BACKSLASH:
+            relative = relative.replace('/', '\\')
+        return relative.translate(_XML_ATTR_ESCAPE)
+
+    def _AddFileItemGroups(self, buf: io.StringIO, rel_bundle):
         """添加文件项目组 - 只作为显示用途，不参与编译"""
-        # 使用项目文件的父目录计算相对路径
-        project_dir = project_file.parent
-        
-        # 收集所有文件，但都作为 None 类型（不参与编译，只用于显示）
-        all_files = []
-        
-        # 添加源文件（作为显示）
-        source_files = project_info.GetSourceFiles()
-        all_files.extend(source_files)
-        
-        # 添加头文件（作为显示）
-        header_files = project_info.GetHeaderFiles()
-        all_files.extend(header_files)
-        
-        # 添加其他文件（Meta、Config 等）
-        for group in [FileGroup.META, FileGroup.CONFIGS]:
-            all_files.extend(project_info.files[group])
-        
-        # 将所有文件作为 None 类型添加（仅用于显示，不参与编译）
-        if all_files:
-            lines.append('  <ItemGroup>')
-            for file_info in all_files:
-                relative_path = self._GetRelativePath(file_info.path, project_file.parent)
-                lines.append(f'    <None Include="{relative_path}" />')
-            lines.append('  </ItemGroup>')
+        # 所有文件统一作为 None 类型（不参与编译，只用于显示）；
+        # 相对路径在 GenerateProject 中已算好，这里直接拼接
+        rel_sources, rel_headers, rel_configs, rel_meta = rel_bundle
+        rel_paths = [*rel_sources, *rel_headers, *rel_meta, *rel_configs]
+        if not rel_paths:
+            return
+        
+        # 预先算好的相对路径一次 join 写入，循环内不再逐条 write
+        buf.write('  <ItemGroup>\n    ')
+        buf.write('\n    '.join(_FILE_ITEM_TEMPLATE % p for p in rel_paths))
+        buf.write('\n  </ItemGroup>\n')
     
-    def _GenerateFiltersContent(self, project_info: ProjectInfo, project_file: Path) -> str:
+    def _GenerateFiltersContent(self, rel_bundle) -> str:
         """生成 vcxproj.filters 文件内容"""
-        lines = []
-        
-        # XML 头和项目开始
-        lines.extend([
-            '<?xml version="1.0" encoding="utf-8"?>',
-            '<Project ToolsVersion="4.0" xmlns="http://schemas.microsoft.com/developer/msbuild/2003">'
-        ])
-        
-        # 定义过滤器（文件夹）
-        lines.extend([
-            '  <ItemGroup>',
-            '    <Filter Include="Headers">',
-            '      <UniqueIdentifier>{93995380-89BD-4b04-88EB-625FBE52EBFB}</UniqueIdentifier>',
-            '      <Extensions>h;hh;hpp;hxx;h++;hm;inl;inc;ipp;xsd</Extensions>',
-            '    </Filter>',
-            '    <Filter Include="Sources">',
-            '      <UniqueIdentifier>{4FC737F1-C7A5-4376-A066-2A32D752A2FF}</UniqueIdentifier>',
-            '      <Extensions>cpp;c;cc;cxx;c++;cppm;ixx;def;odl;idl;hpj;bat;asm;asmx</Extensions>',
-            '    </Filter>',
-            '    <Filter Include="Configs">',
-            '      <UniqueIdentifier>{67DA6AB6-F800-4c08-8B7A-83BB121AAD01}</UniqueIdentifier>',
-            '      <Extensions>rc;ico;cur;bmp;dlg;rc2;rct;bin;rgs;gif;jpg;jpeg;jpe;resx;tiff;tif;png;wav;mfcribbon-ms</Extensions>',
-            '    </Filter>',
-            '    <Filter Include="Meta">',
-            '      <UniqueIdentifier>{50E4BC84-97C0-4d2e-A7E7-F3D35DB497D0}</UniqueIdentifier>',
-            '    </Filter>',
-            '  </ItemGroup>'
-        ])
-        
-        # 收集所有文件并按类型分组（所有文件都使用 None 类型）
-        source_files = project_info.GetSourceFiles()
-        header_files = project_info.GetHeaderFiles()
-        config_files = project_info.files[FileGroup.CONFIGS]
-        meta_files = project_info.files[FileGroup.META]
-        
-        # 所有文件都作为 None 类型添加到过滤器
-        all_categorized_files = []
-        
-        # 源文件
-        for file_info in source_files:
-            all_categorized_files.append((file_info, 'Sources'))
-        
-        # 头文件
-        for file_info in header_files:
-            all_categorized_files.append((file_info, 'Headers'))
-            
-        # 配置文件
-        for file_info in config_files:
-            all_categorized_files.append((file_info, 'Configs'))
-            
-        # Meta 文件
-        for file_info in meta_files:
-            all_categorized_files.append((file_info, 'Meta'))
-        
-        # 添加所有文件到过滤器（统一使用 None 类型）
-        if all_categorized_files:
-            lines.append('  <ItemGroup>')
-            for file_info, filter_name in all_categorized_files:
-                relative_path = self._GetRelativePath(file_info.path, project_file.parent)
-                lines.append(f'    <None Include="{relative_path}">')
-                lines.append(f'      <Filter>{filter_name}</Filter>')
-                lines.append('    </None>')
-            lines.append('  </ItemGroup>')
-        
-        # 项目结束
-        lines.append('</Project>')
-        
-        return '\n'.join(lines)
\ No newline at end of file
+        buf = io.StringIO()
+        
+        # XML 头、项目开始和过滤器（文件夹）定义
+        buf.write(_FILTERS_HEADER_XML)
+        
+        # 按分组直接流式产出（相对路径在 GenerateProject 中已算好）
+        rel_sources, rel_headers, rel_configs, rel_meta = rel_bundle
+        categories = (
+            (rel_sources, 'Sources'),
+            (rel_headers, 'Headers'),
+            (rel_configs, 'Configs'),
+            (rel_meta, 'Meta'),
+        )
+        
+        # 添加所有文件到过滤器（统一使用 None 类型），
+        # 每个文件格式化为一个三行块，整组一次 join 写入
+        if any(rel_paths for rel_paths, _ in categories):
+            buf.write('  <ItemGroup>\n')
+            buf.write('\n'.join(
+                _FILTER_ITEM_TEMPLATE % (rel_path, filter_name)
+                for rel_paths, filter_name in categories
+                for rel_path in rel_paths
+            ))
+            buf.write('\n  </ItemGroup>\n')
+        
+        # 项目结束（不带换行，保持输出与 join 版本一致）
+        buf.write('</Project>')
+        
+        return buf.getvalue()
@@ -4,17 +4,88 @@
 生成 XCode Workspace 和 Visual Studio Solution 文件
 """
 
+import io
 import logging
+import operator
+import os
+from collections import defaultdict
 from pathlib import Path
 from typing import List, Dict, Any
 
-from Tools.ProjectGenerator.generators.base_generator import BaseGenerator
+from Tools.ProjectGenerator.generators.base_generator import BaseGenerator, EscapeXmlName
 from Tools.ProjectGenerator.core.project_info import ProjectInfo
 
 
 logger = logging.getLogger(__name__)
 
 
+# 完全不变的样板块：模块导入时构建一次，每次生成只做一次 write
+_XCWORKSPACE_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Workspace\n'
+    '   version = "1.0">\n'
+)
+
+_SLN_HEADER = (
+    "Microsoft Visual Studio Solution File, Format Version 12.00\n"
+    "# Visual Studio Version 17\n"
+    "VisualStudioVersion = 17.0.31903.59\n"
+    "MinimumVisualStudioVersion = 10.0.40219.1\n"
+)
+
+_SLN_GLOBAL_HEADER = (
+    "Global\n"
+    "\tGlobalSection(SolutionConfigurationPlatforms) = preSolution\n"
+    "\t\tDebug|Any CPU = Debug|Any CPU\n"
+    "\t\tDebug|x64 = Debug|x64\n"
+    "\t\tRelease|Any CPU = Release|Any CPU\n"
+    "\t\tRelease|x64 = Release|x64\n"
+    "\tEndGlobalSection\n"
+    "\tGlobalSection(ProjectConfigurationPlatforms) = postSolution\n"
+)
+
+_SLN_NESTED_HEADER = (
+    "\tEndGlobalSection\n"
+    "\tGlobalSection(NestedProjects) = preSolution\n"
+)
+
+# 两类项目的类型 GUID 与配置模板：按 is_csharp 取用，
+# 每个项目一次 .format 取代逐行 f-string
+_CS_TYPE_GUID = "{FAE04EC0-301F-11D3-BF4B-00C04F79EFBC}"
+_CPP_TYPE_GUID = "{8BC9CEB8-8B4A-11D0-8D11-00A0C91BC942}"
+
+# C# 项目使用 Any CPU
+_CS_CFG_TMPL = (
+    "\t\t{g}.Debug|Any CPU.ActiveCfg = Debug|Any CPU\n"
+    "\t\t{g}.Debug|Any CPU.Build.0 = Debug|Any CPU\n"
+    "\t\t{g}.Debug|x64.ActiveCfg = Debug|Any CPU\n"
+    "\t\t{g}.Debug|x64.Build.0 = Debug|Any CPU\n"
+    "\t\t{g}.Release|Any CPU.ActiveCfg = Release|Any CPU\n"
+    "\t\t{g}.Release|Any CPU.Build.0 = Release|Any CPU\n"
+    "\t\t{g}.Release|x64.ActiveCfg = Release|Any CPU\n"
+    "\t\t{g}.Release|x64.Build.0 = Release|Any CPU\n"
+)
+
+# C++ 项目使用 x64
+_CPP_CFG_TMPL = (
+    "\t\t{g}.Debug|Any CPU.ActiveCfg = Debug|x64\n"
+    "\t\t{g}.Debug|x64.ActiveCfg = Debug|x64\n"
+    "\t\t{g}.Debug|x64.Build.0 = Debug|x64\n"
+    "\t\t{g}.Release|Any CPU.ActiveCfg = Release|x64\n"
+    "\t\t{g}.Release|x64.ActiveCfg = Release|x64\n"
+    "\t\t{g}.Release|x64.Build.0 = Release|x64\n"
+)
+
+# 结尾段最后一行不带换行，保持输出与 join 版本一致
+_SLN_FOOTER = (
+    "\tEndGlobalSection\n"
+    "\tGlobalSection(SolutionProperties) = preSolution\n"
+    "\t\tHideSolutionNode = FALSE\n"
+    "\tEndGlobalSection\n"
+    "EndGlobal"
+)
+
+
 class WorkspaceGenerator(BaseGenerator):
     """工作空间生成器"""
     
@@ -59,12 +130,10 @@ class WorkspaceGenerator(BaseGenerator):
         # 按分组组织项目
         groups = self._GroupProjects(projects)
         
-        # 生成 XML 内容
-        lines = [
-            '<?xml version="1.0" encoding="UTF-8"?>',
-            '<Workspace',
-            '   version = "1.0">'
-        ]
+        # 生成 XML 内容（StringIO 连续缓冲累积，免去小字符串列表和最终 join）
+        buf = io.StringIO()
+        w = buf.write
+        w(_XCWORKSPACE_HEADER)
         
         for group_name, group_projects in groups.items():
             if not group_projects:
@@ -75,25 +144,25 @@ class WorkspaceGenerator(BaseGenerator):
             if not cpp_projects:
                 continue
             
-            lines.append(f'   <Group')
-            lines.append(f'      location = "container:"')
-            lines.append(f'      name = "{group_name}">')
+            safe_group = EscapeXmlName(group_name)
+            w(f'   <Group\n'
+              f'      location = "container:"\n'
+              f'      name = "{safe_group}">\n')
             
             for project in cpp_projects:
                 # 工作空间现在在 ProjectFiles/ 目录中，所以路径相对于 ProjectFiles/
-                project_path = f"{group_name}/{project.name}.xcodeproj"
-                lines.append(f'      <FileRef')
-                lines.append(f'         location = "group:{project_path}">')
-                lines.append(f'      </FileRef>')
+                w(f'      <FileRef\n'
+                  f'         location = "group:{safe_group}/{EscapeXmlName(project.name)}.xcodeproj">\n'
+                  f'      </FileRef>\n')
             
-            lines.append('   </Group>')
-        
-        lines.append('</Workspace>')
-        
-        # 写入文件
-        content = '\n'.join(lines)
-        workspace_data_path.write_text(content, encoding='utf-8')
+            w('   </Group>\n')
         
+        # 最后一行不带换行，保持输出与 join 版本一致
+        w('</Workspace>')
+
+        # 写入文件（内容未变化时跳过，避免无意义的 mtime 更新）
+        self._WriteIfChanged(workspace_data_path, buf.getvalue())
+
         logger.info(f"生成 XCode 工作空间: {workspace_path}")
         return workspace_path
     
@@ -101,19 +170,27 @@ class WorkspaceGenerator(BaseGenerator):
         """生成 Visual Studio 解决方案"""
         solution_path = self.project_root / "ProjectFiles" / "Nut.sln"
         
-        lines = [
-            "Microsoft Visual Studio Solution File, Format Version 12.00",
-            "# Visual Studio Version 17", 
-            "VisualStudioVersion = 17.0.31903.59",
-            "MinimumVisualStudioVersion = 10.0.40219.1"
-        ]
+        buf = io.StringIO()
+        w = buf.write
+        w(_SLN_HEADER)
         
         # 按分组组织项目
         groups = self._GroupProjects(projects)
         
-        # 生成项目配置和嵌套项目数据
-        project_configs = []
-        nested_projects = []
+        # Source 根前缀只构造一次，C# 项目路径直接按前缀裁剪
+        source_root = self.project_root / 'Source'
+        source_root_prefix = str(source_root) + os.sep
+        
+        # 分组文件夹 GUID 每组只算一次，不在逐项目循环里反复哈希
+        folder_guids = {
+            group_name: self.uuid_generator.GenerateGuid(f"Folder_{group_name}")
+            for group_name in groups
+        }
+        
+        # 项目配置和嵌套项目数据直接写进二级缓冲（构造时即带缩进），
+        # 免去中间列表和事后的二次遍历
+        cfg_buf = io.StringIO()
+        nest_buf = io.StringIO()
         
         # 添加项目
         for group_name, group_projects in groups.items():
@@ -124,103 +201,87 @@ class WorkspaceGenerator(BaseGenerator):
                 guid = self.uuid_generator.GenerateGuid(project.name)
                 
                 if project.is_csharp:
-                    project_type_guid = "{FAE04EC0-301F-11D3-BF4B-00C04F79EFBC}"
+                    project_type_guid = _CS_TYPE_GUID
+                    cfg_tmpl = _CS_CFG_TMPL
                     # 解决方案现在在 ProjectFiles/ 中，所以需要 ../ 来访问 Source/
-                    project_file = f"../Source/{project.path.relative_to(self.project_root / 'Source')}/{project.name}.csproj"
+                    path_str = str(project.path)
+                    if path_str.startswith(source_root_prefix):
+                        rel_source = path_str[len(source_root_prefix):]
+                    else:
+                        rel_source = str(project.path.relative_to(source_root))
+                    project_file = f"../Source/{rel_source}/{project.name}.csproj"
                 else:
-                    project_type_guid = "{8BC9CEB8-8B4A-11D0-8D11-00A0C91BC942}" 
+                    project_type_guid = _CPP_TYPE_GUID
+                    cfg_tmpl = _CPP_CFG_TMPL
                     # 解决方案现在在 ProjectFiles/ 中，vcxproj 文件也在其中
                     project_file = f"{group_name}/{project.name}.vcxproj"
                 
-                lines.append(f'Project("{project_type_guid}") = "{project.name}", "{project_file}", "{guid}"')
-                lines.append("EndProject")
+                w(f'Project("{project_type_guid}") = "{project.name}", "{project_file}", "{guid}"\n'
+                  'EndProject\n')
                 
-                # 添加项目配置（根据项目类型选择平台）
-                if project.is_csharp:
-                    # C# 项目使用 Any CPU
-                    project_configs.extend([
-                        f"{guid}.Debug|Any CPU.ActiveCfg = Debug|Any CPU",
-                        f"{guid}.Debug|Any CPU.Build.0 = Debug|Any CPU", 
-                        f"{guid}.Debug|x64.ActiveCfg = Debug|Any CPU",
-                        f"{guid}.Debug|x64.Build.0 = Debug|Any CPU",
-                        f"{guid}.Release|Any CPU.ActiveCfg = Release|Any CPU",
-                        f"{guid}.Release|Any CPU.Build.0 = Release|Any CPU",
-                        f"{guid}.Release|x64.ActiveCfg = Release|Any CPU",
-                        f"{guid}.Release|x64.Build.0 = Release|Any CPU"
-                    ])
-                else:
-                    # C++ 项目使用 x64
-                    project_configs.extend([
-                        f"{guid}.Debug|Any CPU.ActiveCfg = Debug|x64",
-                        f"{guid}.Debug|x64.ActiveCfg = Debug|x64",
-                        f"{guid}.Debug|x64.Build.0 = Debug|x64",
-                        f"{guid}.Release|Any CPU.ActiveCfg = Release|x64",
-                        f"{guid}.Release|x64.ActiveCfg = Release|x64",
-                        f"{guid}.Release|x64.Build.0 = Release|x64"
-                    ])
+                # 添加项目配置（模板在上面按项目类型选好）
+                cfg_buf.write(cfg_tmpl.format(g=guid))
                 
                 # 添加嵌套项目
-                group_guid = self.uuid_generator.GenerateGuid(f"Folder_{group_name}")
-                nested_projects.append(f"{guid} = {group_guid}")
+                nest_buf.write(f"\t\t{guid} = {folder_guids[group_name]}\n")
         
         # 添加文件夹
         for group_name in groups.keys():
             if groups[group_name]:  # 只添加非空分组
-                group_guid = self.uuid_generator.GenerateGuid(f"Folder_{group_name}")
-                lines.append(f'Project("{{2150E333-8FDC-42A3-9474-1A3956D46DE8}}") = "{group_name}", "{group_name}", "{group_guid}"')
-                lines.append("EndProject")
+                group_guid = folder_guids[group_name]
+                w(f'Project("{{2150E333-8FDC-42A3-9474-1A3956D46DE8}}") = "{group_name}", "{group_name}", "{group_guid}"\n'
+                  'EndProject\n')
         
         # 添加全局配置
-        lines.extend([
-            "Global",
-            "\tGlobalSection(SolutionConfigurationPlatforms) = preSolution",
-            "\t\tDebug|Any CPU = Debug|Any CPU",
-            "\t\tDebug|x64 = Debug|x64",
-            "\t\tRelease|Any CPU = Release|Any CPU", 
-            "\t\tRelease|x64 = Release|x64",
-            "\tEndGlobalSection",
-            "\tGlobalSection(ProjectConfigurationPlatforms) = postSolution"
-        ])
-        
-        for config in project_configs:
-            lines.append(f"\t\t{config}")
-        
+        w(_SLN_GLOBAL_HEADER)
+        w(cfg_buf.getvalue())
+
         # 添加嵌套项目
-        lines.extend([
-            "\tEndGlobalSection",
-            "\tGlobalSection(NestedProjects) = preSolution"
-        ])
-        
-        for nested in nested_projects:
-            lines.append(f"\t\t{nested}")
-        
-        lines.extend([
-            "\tEndGlobalSection",
-            "\tGlobalSection(SolutionProperties) = preSolution",
-            "\t\tHideSolutionNode = FALSE",
-            "\tEndGlobalSection",
-            "EndGlobal"
-        ])
-        
-        # 写入文件
-        content = '\n'.join(lines)
-        solution_path.write_text(content, encoding='utf-8')
+        w(_SLN_NESTED_HEADER)
+        w(nest_buf.getvalue())
+
+        # 结尾段
+        w(_SLN_FOOTER)
         
+        # 写入文件（内容未变化时跳过，避免无意义的 mtime 更新）
+        self._WriteIfChanged(solution_path, buf.getvalue())
+
         logger.info(f"生成 Visual Studio 解决方案: {solution_path}")
         return solution_path
     
+    def _WriteIfChanged(self, output_path: Path, content: str):
+        """仅在内容发生变化时写入文件
+
+        跳过无变化的写入可以减少 write 系统调用，
+        也避免下游构建系统因 mtime 变化触发不必要的重建。
+        内容预先编码为 UTF-8 字节：比较用 read_bytes（先比大小，
+        纯 stat 即可判掉多数不一致），写入经 os.write 单次落盘，
+        绕过 TextIOWrapper 的分块编码。
+        """
+        data = content.encode('utf-8')
+
+        try:
+            if os.stat(output_path).st_size == len(data) and output_path.read_bytes() == data:
+                logger.debug(f"内容未变化，跳过写入: {output_path}")
+                return
+        except OSError:
+            pass
+
+        fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
     def _GroupProjects(self, projects: List[ProjectInfo]) -> Dict[str, List[ProjectInfo]]:
-        """将项目按分组组织"""
-        groups = {}
-        
-        for project in projects:
-            group_name = project.group_name
-            if group_name not in groups:
-                groups[group_name] = []
-            groups[group_name].append(project)
-        
-        # 按项目名称排序
-        for group_projects in groups.values():
-            group_projects.sort(key=lambda p: p.name)
+        """将项目按分组组织
+
+        先整体按项目名稳定排序一次，再用 defaultdict 分组：
+        每组天然有序，省去逐组 sort 和按键双重查找。
+        """
+        groups = defaultdict(list)
+        
+        for project in sorted(projects, key=operator.attrgetter('name')):
+            groups[project.group_name].append(project)
         
         return groups
\ No newline at end of file
@@ -5,6 +5,7 @@ XCode 项目生成器
 """
 
 import logging
+import os
 from pathlib import Path
 from typing import Dict, Any
 
@@ -19,6 +20,11 @@ logger = logging.getLogger(__name__)
 class XCodeProjectGenerator(BaseGenerator):
     """XCode 项目生成器"""
     
+    @classmethod
+    def ShouldGenerate(cls, project_info: ProjectInfo) -> bool:
+        """C# 项目不生成 Xcode 工程"""
+        return not project_info.is_csharp
+    
     @property
     def FileExtension(self) -> str:
         return ".xcodeproj"
@@ -58,9 +64,32 @@ class XCodeProjectGenerator(BaseGenerator):
         # 使用 XML 构建器生成文件
         xml_builder = XmlBuilder()
         content = xml_builder.BuildPbxproj(project_data)
-        
+
         # 写入文件
-        output_path.write_text(content, encoding='utf-8')
+        self._WritePbxproj(output_path, content)
+
+    @staticmethod
+    def _WritePbxproj(output_path: Path, content: str):
+        """将 pbxproj 内容以字节形式单次落盘
+
+        只编码一次 UTF-8 字节，经 os.write 单个系统调用写出，
+        绕过 TextIOWrapper 的分块编码；内容未变化时跳过写入，
+        避免无意义的 mtime 更新。
+        """
+        data = content.encode('utf-8')
+
+        try:
+            if os.stat(output_path).st_size == len(data) and output_path.read_bytes() == data:
+                logger.debug(f"内容未变化，跳过写入: {output_path}")
+                return
+        except OSError:
+            pass
+
+        fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
     
     def _GenerateUuids(self, project_info: ProjectInfo) -> Dict[str, Any]:
         """生成项目所需的所有 UUID"""
@@ -83,18 +112,21 @@ class XCodeProjectGenerator(BaseGenerator):
         for group in FileGroup:
             uuids[f'group_{group.value.lower()}'] = self.uuid_generator.generate()
         
-        # 为每个文件生成 UUID
-        uuids['file_refs'] = {}
-        uuids['build_files'] = {}
-        
-        all_files = project_info.GetAllFiles()
-        for i, file_info in enumerate(all_files):
-            file_key = f"file_{i}"
-            uuids['file_refs'][file_key] = self.uuid_generator.generate()
-            
-            # 为源文件生成构建文件 UUID（用于 IntelliSense）
+        # 为每个文件生成 UUID（文件数已知，批量一次取足）。
+        # 按文件序号直接索引：file_refs 就是批量结果列表，
+        # build_files 稀疏存储为 dict[int, str]
+        total_files = sum(len(columns) for columns in project_info.files.values())
+        source_count = len(project_info.GetFiles(FileGroup.SOURCES))
+        build_file_batch = iter(self.uuid_generator.GenerateBatch(source_count))
+
+        uuids['file_refs'] = self.uuid_generator.GenerateBatch(total_files)
+        build_files = uuids['build_files'] = {}
+
+        # 只遍历一次，用惰性迭代避免物化完整文件列表；
+        # 为源文件生成构建文件 UUID（用于 IntelliSense）
+        for i, file_info in enumerate(project_info.IterAllFiles()):
             if file_info.group == FileGroup.SOURCES:
-                uuids['build_files'][file_key] = self.uuid_generator.generate()
+                build_files[i] = next(build_file_batch)
         
         # 添加 Sources Build Phase UUID（用于 IntelliSense）
         uuids['build_phase_sources'] = self.uuid_generator.generate()
@@ -111,66 +143,74 @@ class XCodeProjectGenerator(BaseGenerator):
         else:
             product_type = "com.apple.product-type.library.static"
         
-        # 构建文件引用数据
+        # 单次遍历同时产出文件引用、构建文件和按分组的子项桶，
+        # 取代原来的三趟扫描和 O(分组数·文件数) 的嵌套过滤
         file_refs_data = []
+        build_files_data = []
+        group_children = {group: [] for group in FileGroup}
         project_output_dir = self.project_root / "ProjectFiles" / project_info.group_name
-        
+        # 前缀字符串只构造一次，循环内用 startswith + 切片取代
+        # relative_to 的逐段比较和 ValueError 异常回退；
+        # 同目录文件大量重复，相对父目录按目录缓存，逐文件只拼文件名
+        project_output_prefix = str(project_output_dir) + os.sep
+        root_prefix = str(self.project_root) + os.sep
+        sources_group = FileGroup.SOURCES
+        dir_cache = {}
+        sep = os.sep
+        file_refs_uuids = uuids['file_refs']
+        build_files_uuids = uuids['build_files']
+
         for i, file_info in enumerate(all_files):
-            file_key = f"file_{i}"
-            
+            file_ref_uuid = file_refs_uuids[i]
+            # name/group 是按需计算的属性，循环体内多处使用时只取一次
+            file_name = file_info.name
+            file_group = file_info.group
+
             # 计算相对于项目文件所在目录的路径
             # 项目文件在 ProjectFiles/GroupName/ProjectName.xcodeproj
-            # 需要从该目录返回到项目根目录，然后到达实际文件
-            try:
-                relative_path = file_info.path.relative_to(project_output_dir)
-            except ValueError:
-                # 如果文件不在项目输出目录下，计算相对路径
-                # 从 ProjectFiles/GroupName 到项目根目录需要 ../../
-                # 然后加上从项目根目录到文件的相对路径
-                root_to_file = file_info.path.relative_to(self.project_root)
-                relative_path = Path("../../") / root_to_file
-            
+            # 文件通常不在输出目录下：从 ProjectFiles/GroupName 返回
+            # 项目根目录需要 ../../，再接根目录到文件的相对路径
+            parent = file_info.path_str.rpartition(sep)[0]
+            rel_parent = dir_cache.get(parent)
+            if rel_parent is None:
+                if (parent + sep).startswith(project_output_prefix):
+                    rel_parent = parent[len(project_output_prefix):]
+                else:
+                    rel_parent = "../../" + parent[len(root_prefix):]
+                dir_cache[parent] = rel_parent
+            relative_path = rel_parent + sep + file_name if rel_parent else file_name
+
             file_refs_data.append({
-                'uuid': uuids['file_refs'][file_key],
-                'name': file_info.name,
-                'path': str(relative_path),
+                'uuid': file_ref_uuid,
+                'name': file_name,
+                'path': relative_path,
                 'file_type': file_info.file_type,
                 'source_tree': '<group>'
             })
-        
-        # 构建构建文件数据（用于 Sources Build Phase 的 IntelliSense）
-        build_files_data = []
-        for i, file_info in enumerate(all_files):
-            file_key = f"file_{i}"
-            if file_info.group == FileGroup.SOURCES:
+
+            # 构建文件数据（用于 Sources Build Phase 的 IntelliSense）
+            if file_group == sources_group:
                 build_files_data.append({
-                    'uuid': uuids['build_files'][file_key],
-                    'file_ref': uuids['file_refs'][file_key],
-                    'file_name': str(file_info.relative_path)
+                    'uuid': build_files_uuids[i],
+                    'file_ref': file_ref_uuid,
+                    'file_name': file_info.relative_path_str
                 })
-        
-        # 构建文件组数据
-        groups_data = []
-        for group in FileGroup:
-            group_files = project_info.files[group]
-            if not group_files:
-                continue
-            
-            children = []
-            for i, file_info in enumerate(all_files):
-                if file_info.group == group:
-                    file_key = f"file_{i}"
-                    children.append({
-                        'uuid': uuids['file_refs'][file_key],
-                        'name': file_info.name
-                    })
-            
-            groups_data.append({
+
+            group_children[file_group].append({
+                'uuid': file_ref_uuid,
+                'name': file_name
+            })
+
+        # 构建文件组数据（直接取各分组的桶）
+        groups_data = [
+            {
                 'uuid': uuids[f'group_{group.value.lower()}'],
                 'name': group.value,
-                'children': children
-            })
-        
+                'children': group_children[group]
+            }
+            for group in FileGroup if group_children[group]
+        ]
+
         return {
             'project_name': project_info.name,
             'product_type': product_type,
@@ -180,6 +220,6 @@ class XCodeProjectGenerator(BaseGenerator):
             'groups': groups_data,
             'main_group_children': [
                 {'uuid': uuids[f'group_{group.value.lower()}'], 'name': group.value}
-                for group in FileGroup if project_info.files[group]
+                for group in FileGroup if group_children[group]
             ]
         }
\ No newline at end of file
@@ -13,8 +13,7 @@ tool_dir = Path(__file__).parent
 project_root = tool_dir.parent.parent
 sys.path.insert(0, str(project_root))
 
-# 导入并运行 CLI
-from Tools.ProjectGenerator.cli import main
-
 if __name__ == '__main__':
+    # CLI 及其传递依赖推迟到真正执行时再导入，降低启动延迟
+    from Tools.ProjectGenerator.cli import main
     main()
\ No newline at end of file
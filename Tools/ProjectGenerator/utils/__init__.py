@@ -4,12 +4,25 @@
 包含各种辅助工具和实用函数
 """
 
-from Tools.ProjectGenerator.utils.uuid_generator import UuidGenerator
-from Tools.ProjectGenerator.utils.path_utils import PathUtils
-from Tools.ProjectGenerator.utils.xml_builder import XmlBuilder
-
 __all__ = [
     "UuidGenerator",
-    "PathUtils", 
+    "PathUtils",
     "XmlBuilder"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    """PEP 562 惰性导入
+
+    按需导入各工具模块，避免只用到其中一个时的无谓加载。
+    """
+    if name == "UuidGenerator":
+        from Tools.ProjectGenerator.utils.uuid_generator import UuidGenerator
+        return UuidGenerator
+    if name == "PathUtils":
+        from Tools.ProjectGenerator.utils.path_utils import PathUtils
+        return PathUtils
+    if name == "XmlBuilder":
+        from Tools.ProjectGenerator.utils.xml_builder import XmlBuilder
+        return XmlBuilder
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -10,6 +10,34 @@ from pathlib import Path
 from typing import Optional
 
 
+# 扩展名到文件类型的映射（模块级常量，绑定 .get 免去每次调用重建字典）
+_EXT_TYPES = {
+    # C/C++ 文件类型
+    '.cpp': 'cpp',
+    '.cxx': 'cpp',
+    '.cc': 'cpp',
+    '.c': 'c',
+    '.h': 'header',
+    '.hpp': 'header',
+    '.hxx': 'header',
+    '.hh': 'header',
+    # 其他文件类型
+    '.cs': 'csharp',
+    '.py': 'python',
+    '.json': 'json',
+    '.xml': 'xml',
+    '.proto': 'protobuf',
+    '.md': 'markdown',
+    '.txt': 'text',
+    '.yaml': 'yaml',
+    '.yml': 'yaml'
+}
+_EXT_GET = _EXT_TYPES.get
+
+# Windows 非法字符替换表（str.translate 在 C 层单趟完成替换）
+_SAFE_TABLE = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
+
 class PathUtils:
     """路径工具类"""
     
@@ -60,11 +88,11 @@ class PathUtils:
         Returns:
             如果 child 是 parent 的子目录返回 True
         """
-        try:
-            child.resolve().relative_to(parent.resolve())
-            return True
-        except ValueError:
-            return False
+        # abspath 是纯字符串运算，不触发 resolve 的 stat/符号链接解析；
+        # 前缀比较即可判定包含关系（不跟随符号链接）
+        child_str = os.path.abspath(child)
+        parent_str = os.path.abspath(parent)
+        return child_str == parent_str or child_str.startswith(parent_str + os.sep)
     
     @staticmethod
     def FindCommonParent(paths: list[Path]) -> Optional[Path]:
@@ -79,30 +107,16 @@ class PathUtils:
         """
         if not paths:
             return None
-        
+
         if len(paths) == 1:
             return paths[0].parent
-        
-        # 转换为绝对路径
-        abs_paths = [p.resolve() for p in paths]
-        
-        # 获取所有路径的部分
-        path_parts = [list(p.parts) for p in abs_paths] 
-        
-        # 找到共同前缀
-        common_parts = []
-        min_length = min(len(parts) for parts in path_parts)
-        
-        for i in range(min_length):
-            part = path_parts[0][i]
-            if all(parts[i] == part for parts in path_parts):
-                common_parts.append(part)
-            else:
-                break
-        
-        if common_parts:
-            return Path(*common_parts)
-        else:
+
+        # commonpath 在 C 实现的 os.path 层做前缀比较，
+        # abspath 为纯字符串运算（不解析符号链接）
+        try:
+            return Path(os.path.commonpath([os.path.abspath(p) for p in paths]))
+        except ValueError:
+            # 路径分属不同驱动器（Windows）时没有共同父目录
             return None
     
     @staticmethod
@@ -130,34 +144,7 @@ class PathUtils:
         Returns:
             文件类型标识符
         """
-        suffix = file_path.suffix.lower()
-        
-        # C/C++ 文件类型映射
-        cpp_types = {
-            '.cpp': 'cpp',
-            '.cxx': 'cpp', 
-            '.cc': 'cpp',
-            '.c': 'c',
-            '.h': 'header',
-            '.hpp': 'header',
-            '.hxx': 'header',
-            '.hh': 'header'
-        }
-        
-        # 其他文件类型
-        other_types = {
-            '.cs': 'csharp',
-            '.py': 'python',
-            '.json': 'json',
-            '.xml': 'xml',
-            '.proto': 'protobuf',
-            '.md': 'markdown',
-            '.txt': 'text',
-            '.yaml': 'yaml',
-            '.yml': 'yaml'
-        }
-        
-        return cpp_types.get(suffix) or other_types.get(suffix, 'unknown')
+        return _EXT_GET(file_path.suffix.lower(), 'unknown')
     
     @staticmethod
     def SafeFilename(name: str) -> str:
@@ -170,17 +157,8 @@ class PathUtils:
         Returns:
             安全的文件名
         """
-        # Windows 非法字符
-        illegal_chars = '<>:"/\\|?*'
-        
-        # 替换非法字符为下划线
-        safe_name = ''.join('_' if c in illegal_chars else c for c in name)
-        
-        # 移除首尾空格和点号
-        safe_name = safe_name.strip(' .')
-        
+        # 替换非法字符为下划线，再移除首尾空格和点号
+        safe_name = name.translate(_SAFE_TABLE).strip(' .')
+
         # 确保不为空
-        if not safe_name:
-            safe_name = 'unnamed'
-        
-        return safe_name
\ No newline at end of file
+        return safe_name or 'unnamed'
\ No newline at end of file
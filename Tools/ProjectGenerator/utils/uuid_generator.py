@@ -5,10 +5,9 @@ UUID 生成器
 """
 
 import hashlib
+import os
 import uuid
-import platform
-import subprocess
-from typing import Optional
+from typing import List, Optional
 
 
 class UuidGenerator:
@@ -39,6 +38,33 @@ class UuidGenerator:
         else:
             return self._GenerateRandom()
     
+    def GenerateBatch(self, count: int, seed: Optional[str] = None) -> List[str]:
+        """
+        批量生成 UUID
+
+        随机模式一次 os.urandom 取足全部字节；确定性模式用
+        shake_128 从单个种子一次挤出整条输出流，免去逐个
+        重建哈希对象和计数器拼接。
+
+        Args:
+            count: 需要的 UUID 数量
+            seed: 种子字符串，用于确定性生成
+
+        Returns:
+            24位大写十六进制 UUID 列表
+        """
+        if count <= 0:
+            return []
+
+        if self.deterministic and seed:
+            full_seed = f"{seed}_{self._counter}"
+            self._counter += count
+            stream = hashlib.shake_128(full_seed.encode('utf-8')).hexdigest(12 * count).upper()
+        else:
+            stream = os.urandom(12 * count).hex().upper()
+
+        return [stream[i:i + 24] for i in range(0, 24 * count, 24)]
+
     def GenerateGuid(self, name: str) -> str:
         """
         生成 GUID（Visual Studio 格式）
@@ -63,18 +89,12 @@ class UuidGenerator:
         ).upper()
     
     def _GenerateRandom(self) -> str:
-        """生成随机 UUID"""
-        if platform.system() == 'Darwin':
-            # macOS 上使用 uuidgen
-            try:
-                result = subprocess.run(['uuidgen'], capture_output=True, text=True)
-                if result.returncode == 0:
-                    return result.stdout.strip().replace('-', '')[:24].upper()
-            except:
-                pass
-        
-        # fallback 到 Python uuid
-        return str(uuid.uuid4()).replace('-', '')[:24].upper()
+        """生成随机 UUID
+
+        直接使用 Python 的 uuid4：之前 macOS 上每个 UUID 都
+        fork+exec 一次 uuidgen，比进程内生成慢几个数量级。
+        """
+        return uuid.uuid4().hex[:24].upper()
     
     def _GenerateDeterministic(self, seed: str) -> str:
         """基于种子生成确定性 UUID"""
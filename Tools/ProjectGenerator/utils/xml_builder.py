@@ -4,492 +4,506 @@ XML 构建器
 用于构建 XCode 项目文件和其他 XML 格式文件
 """
 
-from typing import Dict, Any, List
-from xml.dom.minidom import Document
+import hashlib
+import io
+from functools import lru_cache
+from typing import Dict, Any
+
+
+@lru_cache(maxsize=128)
+def _DeriveUuid(project_name: str, role: str) -> str:
+    """按（项目名, 角色）派生稳定的 24 位十六进制 UUID
+
+    blake2b 为用户态哈希，比 uuid4 的内核随机读取便宜，且结果
+    确定——同一项目重复生成时 pbxproj 对应对象 ID 不再抖动。
+    随机角色仍走 UuidGenerator；本辅助用于无需随机性的固定对象。
+    """
+    return hashlib.blake2b((project_name + role).encode(), digest_size=12).hexdigest().upper()
+
+
+# 同一份 Source 树会被多个项目重复序列化，而块中只有 UUID 逐项目变化。
+# 这里缓存 UUID 之后的不变尾段（按值命中，跨项目复用），写出时与
+# 当次 UUID 直接拼接，避免每个文件每次生成都重新格式化整块文本。
+
+@lru_cache(maxsize=65536)
+def _RenderFileRefTail(name: str, path: str, file_type: str, source_tree: str) -> str:
+    """渲染 PBXFileReference 块中 UUID 之后的不变部分"""
+    return (f" /* {name} */ = {{\n"
+            "\t\t\tisa = PBXFileReference;\n"
+            f"\t\t\tlastKnownFileType = {file_type};\n"
+            f"\t\t\tpath = \"{path}\";\n"
+            f"\t\t\tname = \"{name}\";\n"
+            f"\t\t\tsourceTree = \"{source_tree}\";\n"
+            "\t\t};\n")
+
+
+@lru_cache(maxsize=65536)
+def _RenderBuildFileMid(file_name: str) -> str:
+    """渲染 PBXBuildFile 块中两个 UUID 之间的不变部分"""
+    return (f" /* {file_name} in Sources */ = {{\n"
+            "\t\t\tisa = PBXBuildFile;\n"
+            "\t\t\tfileRef = ")
+
+
+@lru_cache(maxsize=65536)
+def _RenderChildComment(name: str) -> str:
+    """渲染分组子项 UUID 之后的注释尾段"""
+    return f" /* {name} */,\n"
+
+
+@lru_cache(maxsize=65536)
+def _RenderSourcesEntryComment(file_name: str) -> str:
+    """渲染 Sources Build Phase 条目 UUID 之后的注释尾段"""
+    return f" /* {file_name} in Sources */,\n"
+
+
+# 计入 NutBuild 输入文件的源码扩展名（不含点号，配合 rpartition 使用；
+# 路径都带目录前缀，无扩展名时分割出的尾段必含 / 不会误命中）
+_SOURCE_EXTS = frozenset({"cpp", "c", "cc", "cxx", "h", "hpp", "cs"})
+
+# inputPaths 条目的定界常量：逐文件只追加常量、路径、常量三段，
+# 不再为每个文件构造 f-string
+_INPUT_PATH_PREFIX = "\t\t\t\t\"$(SRCROOT)/"
+_INPUT_PATH_SUFFIX = "\",\n"
+
+# 产品类型 → (产物扩展名, explicitFileType)；未命中一律按可执行文件处理
+_PRODUCT_TYPE_INFO = {
+    "com.apple.product-type.library.static": (".a", "archive.ar"),
+}
+_PRODUCT_TYPE_DEFAULT = ("", "compiled.mach-o.executable")
+
+
+# 构建配置模板：区块内容跨项目完全一致，只有 UUID 逐项目变化。
+# 模块导入时构建一次，生成时每块一次 format_map 填入 UUID
+# （{{ / }} 为 pbxproj 的字面大括号）。
+
+_CFG_DEBUG_PROJECT_TMPL = (
+    "\t\t{config_debug_project} /* Debug */ = {{\n"
+    "\t\t\tisa = XCBuildConfiguration;\n"
+    "\t\t\tbuildSettings = {{\n"
+    "\t\t\t\tALWAYS_SEARCH_USER_PATHS = NO;\n"
+    "\t\t\t\tCLANG_ANALYZER_NONNULL = YES;\n"
+    "\t\t\t\tCLANG_CXX_LANGUAGE_STANDARD = \"gnu++20\";\n"
+    "\t\t\t\tCLANG_ENABLE_MODULES = YES;\n"
+    "\t\t\t\tCLANG_WARN_BOOL_CONVERSION = YES;\n"
+    "\t\t\t\tCLANG_WARN_CONSTANT_CONVERSION = YES;\n"
+    "\t\t\t\tCLANG_WARN_EMPTY_BODY = YES;\n"
+    "\t\t\t\tCLANG_WARN_ENUM_CONVERSION = YES;\n"
+    "\t\t\t\tCLANG_WARN_INT_CONVERSION = YES;\n"
+    "\t\t\t\tCLANG_WARN_UNREACHABLE_CODE = YES;\n"
+    "\t\t\t\tCOPY_PHASE_STRIP = NO;\n"
+    "\t\t\t\tDEBUG_INFORMATION_FORMAT = dwarf;\n"
+    "\t\t\t\tENABLE_STRICT_OBJC_MSGSEND = YES;\n"
+    "\t\t\t\tENABLE_TESTABILITY = YES;\n"
+    "\t\t\t\tGCC_C_LANGUAGE_STANDARD = gnu11;\n"
+    "\t\t\t\tGCC_DYNAMIC_NO_PIC = NO;\n"
+    "\t\t\t\tGCC_NO_COMMON_BLOCKS = YES;\n"
+    "\t\t\t\tGCC_OPTIMIZATION_LEVEL = 0;\n"
+    "\t\t\t\tGCC_PREPROCESSOR_DEFINITIONS = (\n"
+    "\t\t\t\t\t\"DEBUG=1\",\n"
+    "\t\t\t\t\t\"$(inherited)\",\n"
+    "\t\t\t\t);\n"
+    "\t\t\t\tMACOSX_DEPLOYMENT_TARGET = 10.15;\n"
+    "\t\t\t\tONLY_ACTIVE_ARCH = YES;\n"
+    "\t\t\t\tSDKROOT = macosx;\n"
+    "\t\t\t}};\n"
+    "\t\t\tname = Debug;\n"
+    "\t\t}};\n"
+)
+
+_CFG_RELEASE_PROJECT_TMPL = (
+    "\t\t{config_release_project} /* Release */ = {{\n"
+    "\t\t\tisa = XCBuildConfiguration;\n"
+    "\t\t\tbuildSettings = {{\n"
+    "\t\t\t\tALWAYS_SEARCH_USER_PATHS = NO;\n"
+    "\t\t\t\tCLANG_ANALYZER_NONNULL = YES;\n"
+    "\t\t\t\tCLANG_CXX_LANGUAGE_STANDARD = \"gnu++20\";\n"
+    "\t\t\t\tCLANG_ENABLE_MODULES = YES;\n"
+    "\t\t\t\tCLANG_WARN_BOOL_CONVERSION = YES;\n"
+    "\t\t\t\tCLANG_WARN_CONSTANT_CONVERSION = YES;\n"
+    "\t\t\t\tCLANG_WARN_EMPTY_BODY = YES;\n"
+    "\t\t\t\tCLANG_WARN_ENUM_CONVERSION = YES;\n"
+    "\t\t\t\tCLANG_WARN_INT_CONVERSION = YES;\n"
+    "\t\t\t\tCLANG_WARN_UNREACHABLE_CODE = YES;\n"
+    "\t\t\t\tCOPY_PHASE_STRIP = NO;\n"
+    "\t\t\t\tDEBUG_INFORMATION_FORMAT = \"dwarf-with-dsym\";\n"
+    "\t\t\t\tENABLE_NS_ASSERTIONS = NO;\n"
+    "\t\t\t\tENABLE_STRICT_OBJC_MSGSEND = YES;\n"
+    "\t\t\t\tGCC_C_LANGUAGE_STANDARD = gnu11;\n"
+    "\t\t\t\tGCC_NO_COMMON_BLOCKS = YES;\n"
+    "\t\t\t\tMACOSX_DEPLOYMENT_TARGET = 10.15;\n"
+    "\t\t\t\tSDKROOT = macosx;\n"
+    "\t\t\t}};\n"
+    "\t\t\tname = Release;\n"
+    "\t\t}};\n"
+)
+
+# Target 级 Debug/Release 的 buildSettings 完全相同，共用同一主体
+_TARGET_BUILD_SETTINGS = (
+    "\t\t\tisa = XCBuildConfiguration;\n"
+    "\t\t\tbuildSettings = {{\n"
+    "\t\t\t\tPRODUCT_NAME = \"$(TARGET_NAME)\";\n"
+    "\t\t\t\t// 搜索路径配置\n"
+    "\t\t\t\tUSER_HEADER_SEARCH_PATHS = \"$(SRCROOT)/../../Source/**\";\n"
+    "\t\t\t\tHEADER_SEARCH_PATHS = \"$(SRCROOT)/../../ThirdParty/**\";\n"
+    "\t\t\t\t// C++ 语言标准\n"
+    "\t\t\t\tCLANG_CXX_LANGUAGE_STANDARD = \"gnu++20\";\n"
+    "\t\t\t\tCLANG_CXX_LIBRARY = \"libc++\";\n"
+    "\t\t\t\t// 启用代码分析但跳过实际编译\n"
+    "\t\t\t\tSKIP_INSTALL = YES;\n"
+    "\t\t\t\tCODE_SIGN_IDENTITY = \"\";\n"
+    "\t\t\t\t// 禁用原生构建但保留 IntelliSense\n"
+    "\t\t\t\tBUILD_ACTIVE_ARCHITECTURE_ONLY = NO;\n"
+    "\t\t\t\tCOMPILE_SOURCES_BUILD_PHASE_ENABLED = NO;\n"
+    "\t\t\t\tRUN_ONLY_FOR_DEPLOYMENT_POSTPROCESSING = YES;\n"
+    "\t\t\t\t// 强制禁用编译器调用\n"
+    "\t\t\t\tGCC_PREPROCESSOR_DEFINITIONS = (\n"
+    "\t\t\t\t\t\"XCODE_INTELLISENSE_ONLY=1\",\n"
+    "\t\t\t\t\t\"$(inherited)\",\n"
+    "\t\t\t\t);\n"
+    "\t\t\t\tOTHER_CFLAGS = \"-fsyntax-only\";\n"
+    "\t\t\t\t// IntelliSense 相关设置\n"
+    "\t\t\t\tCLANG_ANALYZER_NONNULL = YES;\n"
+    "\t\t\t\tCLANG_WARN_BOOL_CONVERSION = YES;\n"
+    "\t\t\t\tCLANG_WARN_CONSTANT_CONVERSION = YES;\n"
+    "\t\t\t\tCLANG_WARN_EMPTY_BODY = YES;\n"
+    "\t\t\t\tCLANG_WARN_ENUM_CONVERSION = YES;\n"
+    "\t\t\t\tCLANG_WARN_INT_CONVERSION = YES;\n"
+    "\t\t\t\tCLANG_WARN_UNREACHABLE_CODE = YES;\n"
+    "\t\t\t\tGCC_WARN_ABOUT_RETURN_TYPE = YES_ERROR;\n"
+    "\t\t\t\tGCC_WARN_UNDECLARED_SELECTOR = YES;\n"
+    "\t\t\t\tGCC_WARN_UNINITIALIZED_AUTOS = YES_AGGRESSIVE;\n"
+    "\t\t\t\tGCC_WARN_UNUSED_FUNCTION = YES;\n"
+    "\t\t\t\tGCC_WARN_UNUSED_VARIABLE = YES;\n"
+    "\t\t\t}};\n"
+)
+
+# Debug/Release 共用一份 Target 配置模板，生成时分别填入 UUID 与配置名
+_CFG_TARGET_TMPL = (
+    "\t\t{uuid} /* {name} */ = {{\n"
+    + _TARGET_BUILD_SETTINGS +
+    "\t\t\tname = {name};\n"
+    "\t\t}};\n"
+)
+
+_CONFIG_LISTS_TMPL = (
+    "\t\t{config_list_project} /* Build configuration list for PBXProject */ = {{\n"
+    "\t\t\tisa = XCConfigurationList;\n"
+    "\t\t\tbuildConfigurations = (\n"
+    "\t\t\t\t{config_debug_project},\n"
+    "\t\t\t\t{config_release_project},\n"
+    "\t\t\t);\n"
+    "\t\t\tdefaultConfigurationIsVisible = 0;\n"
+    "\t\t\tdefaultConfigurationName = Release;\n"
+    "\t\t}};\n"
+    "\t\t{config_list_target} /* Build configuration list for PBXNativeTarget */ = {{\n"
+    "\t\t\tisa = XCConfigurationList;\n"
+    "\t\t\tbuildConfigurations = (\n"
+    "\t\t\t\t{config_debug_target},\n"
+    "\t\t\t\t{config_release_target},\n"
+    "\t\t\t);\n"
+    "\t\t\tdefaultConfigurationIsVisible = 0;\n"
+    "\t\t\tdefaultConfigurationName = Release;\n"
+    "\t\t}};\n"
+)
+
+
+# NutBuild 脚本主体是静态的，行间以字面 \n 双字符序列相连
+#（pbxproj 的换行表示），项目名以 __PROJECT_NAME__ 占位
+#（哨兵不含引号/反斜杠，转义后原样保留），整体只在模块
+# 导入时转义一次，不再经过行列表与 join
+_NUTBUILD_SCRIPT_RAW = (
+    "#!/bin/bash\\n"
+    "set -e  # Exit on error\\n"
+    "\\n"
+    "# === NutBuild for Xcode ===\\n"
+    "echo \"🔨 Building project: __PROJECT_NAME__\"\\n"
+    "echo \"📁 Xcode SRCROOT: $SRCROOT\"\\n"
+    "echo \"⚙️  Configuration: $CONFIGURATION\"\\n"
+    "echo \"🖥️  Platform: $PLATFORM_NAME\"\\n"
+    "echo \"\"\\n"
+    "\\n"
+    "# Find project root (contains CLAUDE.md)\\n"
+    "PROJECT_ROOT=\"$SRCROOT\"\\n"
+    "while [ ! -f \"$PROJECT_ROOT/CLAUDE.md\" ] && [ \"$PROJECT_ROOT\" != \"/\" ]; do\\n"
+    "    PROJECT_ROOT=\"$(dirname \"$PROJECT_ROOT\")\"\\n"
+    "done\\n"
+    "\\n"
+    "if [ ! -f \"$PROJECT_ROOT/CLAUDE.md\" ]; then\\n"
+    "    echo \"❌ Error: Could not find project root (CLAUDE.md not found)\"\\n"
+    "    exit 1\\n"
+    "fi\\n"
+    "\\n"
+    "echo \"✅ Found project root: $PROJECT_ROOT\"\\n"
+    "cd \"$PROJECT_ROOT\"\\n"
+    "echo \"\"\\n"
+    "\\n"
+    "# Setup NutBuildTools\\n"
+    "NUTBUILD_BINARY=\"$PROJECT_ROOT/Binary/NutBuildTools/NutBuildTools\"\\n"
+    "\\n"
+    "if [ ! -f \"$NUTBUILD_BINARY\" ]; then\\n"
+    "    echo \"📦 NutBuildTools binary not found, building...\"\\n"
+    "    echo \"\"\\n"
+    "    \\n"
+    "    # Find dotnet\\n"
+    "    DOTNET_PATH=\"\"\\n"
+    "    if [ -f \"/usr/local/share/dotnet/dotnet\" ]; then\\n"
+    "        DOTNET_PATH=\"/usr/local/share/dotnet/dotnet\"\\n"
+    "    elif [ -f \"/opt/homebrew/bin/dotnet\" ]; then\\n"
+    "        DOTNET_PATH=\"/opt/homebrew/bin/dotnet\"\\n"
+    "    elif command -v dotnet >/dev/null 2>&1; then\\n"
+    "        DOTNET_PATH=\"dotnet\"\\n"
+    "    else\\n"
+    "        echo \"❌ Error: dotnet not found\"\\n"
+    "        echo \"💡 Please install .NET SDK from https://dotnet.microsoft.com/download\"\\n"
+    "        exit 1\\n"
+    "    fi\\n"
+    "    \\n"
+    "    echo \"🔧 Using dotnet at: $DOTNET_PATH\"\\n"
+    "    echo \"📦 Building NutBuildTools...\"\\n"
+    "    echo \"\"\\n"
+    "    \\n"
+    "    # Build with output\\n"
+    "    \"$DOTNET_PATH\" publish Source/Programs/NutBuildTools -c Release -o Binary/NutBuildTools\\n"
+    "    \\n"
+    "    if [ ! -f \"$NUTBUILD_BINARY\" ]; then\\n"
+    "        echo \"❌ Error: Failed to build NutBuildTools\"\\n"
+    "        exit 1\\n"
+    "    fi\\n"
+    "    echo \"\"\\n"
+    "    echo \"✅ NutBuildTools built successfully\"\\n"
+    "else\\n"
+    "    echo \"✅ NutBuildTools binary found\"\\n"
+    "fi\\n"
+    "\\n"
+    "echo \"\"\\n"
+    "echo \"🚀 Starting compilation with NutBuildTools...\"\\n"
+    "echo \"\"\\n"
+    "\\n"
+    "# Run NutBuildTools with Mac platform (Darwin internal name)\\n"
+    "\"$NUTBUILD_BINARY\" --target __PROJECT_NAME__ --platform Darwin --configuration \"$CONFIGURATION\"\\n"
+    "\\n"
+    "BUILD_RESULT=$?\\n"
+    "echo \"\"\\n"
+    "if [ $BUILD_RESULT -eq 0 ]; then\\n"
+    "    echo \"✅ Build completed successfully!\"\\n"
+    "else\\n"
+    "    echo \"❌ Build failed with exit code $BUILD_RESULT\"\\n"
+    "    exit $BUILD_RESULT\\n"
+    "fi"
+)
+
+# Escape once for pbxproj format
+_NUTBUILD_SCRIPT_ESCAPED = _NUTBUILD_SCRIPT_RAW.replace("\\", "\\\\").replace("\"", "\\\"")
+
+
+@lru_cache(maxsize=128)
+def _GenerateXcodeNutBuildScript(project_name: str) -> str:
+    """生成优化的 Xcode NutBuild 脚本，提供更好的输出显示
+
+    脚本主体已在模块导入时完成拼接与转义，这里只把项目名
+    填入哨兵位；结果按项目名缓存。
+    """
+    return _NUTBUILD_SCRIPT_ESCAPED.replace("__PROJECT_NAME__", project_name)
 
 
 class XmlBuilder:
     """XML 构建器"""
-    
+
     def BuildPbxproj(self, project_data: Dict[str, Any]) -> str:
         """
         构建 XCode project.pbxproj 文件内容
-        
+
+        内容直接写入 StringIO 连续缓冲：每个区块一次 write，
+        免去逐行 append 的小字符串列表和最终的 O(N) join。
+
         Args:
             project_data: 项目数据
-            
+
         Returns:
             pbxproj 文件内容
         """
-        lines = []
-        
+        buf = io.StringIO()
+        w = buf.write
+
         # 文件头
-        lines.extend([
-            "// !$*UTF8*$!",
-            "{",
-            "\tarchiveVersion = 1;",
-            "\tclasses = {",
-            "\t};", 
-            "\tobjectVersion = 46;",
-            "\tobjects = {"
-        ])
-        
+        w("// !$*UTF8*$!\n"
+          "{\n"
+          "\tarchiveVersion = 1;\n"
+          "\tclasses = {\n"
+          "\t};\n"
+          "\tobjectVersion = 46;\n"
+          "\tobjects = {\n")
+
         uuids = project_data['uuids']
-        
+
         # 添加 Project 对象
-        lines.extend([
-            f"\t\t{uuids['project']} /* Project object */ = {{",
-            "\t\t\tisa = PBXProject;",
-            "\t\t\tattributes = {",
-            "\t\t\t\tLastUpgradeCheck = 9999;",
-            "\t\t\t};",
-            f"\t\t\tbuildConfigurationList = {uuids['config_list_project']};",
-            "\t\t\tcompatibilityVersion = \"Xcode 3.2\";", 
-            f"\t\t\tmainGroup = {uuids['main_group']};",
-            "\t\t\ttargets = (",
-            f"\t\t\t\t{uuids['target']},",
-            "\t\t\t);",
-            "\t\t};"
-        ])
-        
-        # 添加主分组
-        lines.extend([
-            f"\t\t{uuids['main_group']} /* Main Group */ = {{",
-            "\t\t\tisa = PBXGroup;",
-            "\t\t\tchildren = ("
-        ])
-        
-        for child in project_data['main_group_children']:
-            lines.append(f"\t\t\t\t{child['uuid']} /* {child['name']} */,")
-        
-        # 为 Products 组生成 UUID
-        products_group_uuid = "1234567890ABCDEF12345678"  # 临时使用固定 UUID
-        lines.append(f"\t\t\t\t{products_group_uuid} /* Products */,")
-        
-        lines.extend([
-            "\t\t\t);",
-            "\t\t\tsourceTree = \"<group>\";",
-            "\t\t};"
-        ])
-        
+        w(f"\t\t{uuids['project']} /* Project object */ = {{\n"
+          "\t\t\tisa = PBXProject;\n"
+          "\t\t\tattributes = {\n"
+          "\t\t\t\tLastUpgradeCheck = 9999;\n"
+          "\t\t\t};\n"
+          f"\t\t\tbuildConfigurationList = {uuids['config_list_project']};\n"
+          "\t\t\tcompatibilityVersion = \"Xcode 3.2\";\n"
+          f"\t\t\tmainGroup = {uuids['main_group']};\n"
+          "\t\t\ttargets = (\n"
+          f"\t\t\t\t{uuids['target']},\n"
+          "\t\t\t);\n"
+          "\t\t};\n")
+
+        # 添加主分组（子项一次 join 后整体写入）
+        w(f"\t\t{uuids['main_group']} /* Main Group */ = {{\n"
+          "\t\t\tisa = PBXGroup;\n"
+          "\t\t\tchildren = (\n")
+
+        w(''.join("\t\t\t\t" + child['uuid'] + _RenderChildComment(child['name'])
+                  for child in project_data['main_group_children']))
+
+        # 为 Products 组派生 UUID（取代原先跨项目重复的固定字面量）
+        products_group_uuid = _DeriveUuid(project_data['project_name'], 'products_group')
+        w(f"\t\t\t\t{products_group_uuid} /* Products */,\n"
+          "\t\t\t);\n"
+          "\t\t\tsourceTree = \"<group>\";\n"
+          "\t\t};\n")
+
         # 添加 Products 分组
-        lines.extend([
-            f"\t\t{products_group_uuid} /* Products */ = {{",
-            "\t\t\tisa = PBXGroup;",
-            "\t\t\tchildren = (",
-            f"\t\t\t\t{uuids['product_ref']} /* {project_data['project_name']} */,",
-            "\t\t\t);",
-            "\t\t\tname = Products;",
-            "\t\t\tsourceTree = \"<group>\";",
-            "\t\t};"
-        ])
-        
-        # 添加文件分组
+        w(f"\t\t{products_group_uuid} /* Products */ = {{\n"
+          "\t\t\tisa = PBXGroup;\n"
+          "\t\t\tchildren = (\n"
+          f"\t\t\t\t{uuids['product_ref']} /* {project_data['project_name']} */,\n"
+          "\t\t\t);\n"
+          "\t\t\tname = Products;\n"
+          "\t\t\tsourceTree = \"<group>\";\n"
+          "\t\t};\n")
+
+        # 添加文件分组（子项先 join 成整段，每个分组只写一次）
         for group in project_data['groups']:
-            lines.extend([
-                f"\t\t{group['uuid']} /* {group['name']} */ = {{",
-                "\t\t\tisa = PBXGroup;",
-                "\t\t\tchildren = ("
-            ])
-            
-            for child in group['children']:
-                lines.append(f"\t\t\t\t{child['uuid']} /* {child['name']} */,")
-            
-            lines.extend([
-                "\t\t\t);",
-                f"\t\t\tname = \"{group['name']}\";",
-                "\t\t\tsourceTree = \"<group>\";",
-                "\t\t};"
-            ])
-        
+            name = group['name']
+            children_str = ''.join(
+                "\t\t\t\t" + child['uuid'] + _RenderChildComment(child['name'])
+                for child in group['children'])
+
+            w(f"\t\t{group['uuid']} /* {name} */ = {{\n"
+              "\t\t\tisa = PBXGroup;\n"
+              "\t\t\tchildren = (\n"
+              + children_str +
+              "\t\t\t);\n"
+              f"\t\t\tname = \"{name}\";\n"
+              "\t\t\tsourceTree = \"<group>\";\n"
+              "\t\t};\n")
+
         # 添加 Target（包含 Sources Build Phase 用于 IntelliSense 和 NutBuild 用于实际编译）
-        lines.extend([
-            f"\t\t{uuids['target']} /* {project_data['project_name']} */ = {{",
-            "\t\t\tisa = PBXNativeTarget;",
-            f"\t\t\tname = \"{project_data['project_name']}\";",
-            f"\t\t\tproductType = \"{project_data['product_type']}\";",
-            f"\t\t\tbuildConfigurationList = {uuids['config_list_target']};",
-            "\t\t\tbuildPhases = (",
-            f"\t\t\t\t{uuids['build_phase_sources']},",
-            f"\t\t\t\t{uuids['build_phase_nutbuild']},",
-            "\t\t\t);",
-            "\t\t\tbuildRules = (",
-            "\t\t\t);",
-            "\t\t\tdependencies = (",
-            "\t\t\t);",
-            f"\t\t\tproductReference = {uuids['product_ref']};",
-            "\t\t};"
-        ])
-        
-        # 添加文件引用
+        w(f"\t\t{uuids['target']} /* {project_data['project_name']} */ = {{\n"
+          "\t\t\tisa = PBXNativeTarget;\n"
+          f"\t\t\tname = \"{project_data['project_name']}\";\n"
+          f"\t\t\tproductType = \"{project_data['product_type']}\";\n"
+          f"\t\t\tbuildConfigurationList = {uuids['config_list_target']};\n"
+          "\t\t\tbuildPhases = (\n"
+          f"\t\t\t\t{uuids['build_phase_sources']},\n"
+          f"\t\t\t\t{uuids['build_phase_nutbuild']},\n"
+          "\t\t\t);\n"
+          "\t\t\tbuildRules = (\n"
+          "\t\t\t);\n"
+          "\t\t\tdependencies = (\n"
+          "\t\t\t);\n"
+          f"\t\t\tproductReference = {uuids['product_ref']};\n"
+          "\t\t};\n")
+
+        # 添加文件引用（尾段按值缓存，跨项目复用）。
+        # 同一趟遍历顺带收集 NutBuild inputPaths 条目到副缓冲，
+        # 后文直接拼接，免去对 file_refs 的第二次扫描
+        input_paths_parts = []
+        collect_input = input_paths_parts.append
         for file_ref in project_data['file_refs']:
-            lines.extend([
-                f"\t\t{file_ref['uuid']} /* {file_ref['name']} */ = {{",
-                "\t\t\tisa = PBXFileReference;",
-                f"\t\t\tlastKnownFileType = {file_ref['file_type']};",
-                f"\t\t\tpath = \"{file_ref['path']}\";",
-                f"\t\t\tname = \"{file_ref['name']}\";",
-                f"\t\t\tsourceTree = \"{file_ref['source_tree']}\";",
-                "\t\t};"
-            ])
-        
-        # 添加产品引用
-        product_extension = ".a" if project_data['product_type'] == "com.apple.product-type.library.static" else ""
-        explicit_file_type = "archive.ar" if project_data['product_type'] == "com.apple.product-type.library.static" else "compiled.mach-o.executable"
-        
-        lines.extend([
-            f"\t\t{uuids['product_ref']} /* {project_data['project_name']}{product_extension} */ = {{",
-            "\t\t\tisa = PBXFileReference;",
-            f"\t\t\texplicitFileType = \"{explicit_file_type}\";",
-            f"\t\t\tpath = \"{project_data['project_name']}{product_extension}\";",
-            "\t\t\tsourceTree = \"BUILT_PRODUCTS_DIR\";",
-            "\t\t};"
-        ])
-        
-        # 添加构建文件（用于 Sources Build Phase 的 IntelliSense 分析）
+            path = file_ref['path']
+            w("\t\t" + file_ref['uuid']
+              + _RenderFileRefTail(file_ref['name'], path,
+                                   file_ref['file_type'], file_ref['source_tree']))
+            if path.rpartition('.')[2] in _SOURCE_EXTS:
+                collect_input(_INPUT_PATH_PREFIX)
+                collect_input(path)
+                collect_input(_INPUT_PATH_SUFFIX)
+
+        # 添加产品引用（产品类型一次查表，同时得到扩展名与文件类型）
+        product_extension, explicit_file_type = _PRODUCT_TYPE_INFO.get(
+            project_data['product_type'], _PRODUCT_TYPE_DEFAULT)
+
+        w(f"\t\t{uuids['product_ref']} /* {project_data['project_name']}{product_extension} */ = {{\n"
+          "\t\t\tisa = PBXFileReference;\n"
+          f"\t\t\texplicitFileType = \"{explicit_file_type}\";\n"
+          f"\t\t\tpath = \"{project_data['project_name']}{product_extension}\";\n"
+          "\t\t\tsourceTree = \"BUILT_PRODUCTS_DIR\";\n"
+          "\t\t};\n")
+
+        # 添加构建文件（用于 Sources Build Phase 的 IntelliSense 分析）。
+        # 同一趟遍历顺带收集 Sources Build Phase 条目到副缓冲
+        sources_phase_parts = []
+        collect_source = sources_phase_parts.append
         for build_file in project_data['build_files']:
-            lines.extend([
-                f"\t\t{build_file['uuid']} /* {build_file['file_name']} in Sources */ = {{",
-                "\t\t\tisa = PBXBuildFile;",
-                f"\t\t\tfileRef = {build_file['file_ref']};",
-                "\t\t};"
-            ])
-        
+            uuid = build_file['uuid']
+            file_name = build_file['file_name']
+            w("\t\t" + uuid
+              + _RenderBuildFileMid(file_name)
+              + build_file['file_ref'] + ";\n\t\t};\n")
+            collect_source("\t\t\t\t" + uuid + _RenderSourcesEntryComment(file_name))
+
         # 添加 NutBuild Shell Script Build Phase
-        shell_script = self._GenerateXcodeNutBuildScript(project_data['project_name'])
-        
-        # 根据项目类型确定输出文件
-        if project_data['product_type'] == "com.apple.product-type.library.static":
-            output_file = f"$(SRCROOT)/../../Binary/{project_data['project_name']}.a"
-        else:
-            output_file = f"$(SRCROOT)/../../Binary/{project_data['project_name']}"
-        
-        # 准备输入文件列表（源文件和元数据文件）
-        input_paths = []
-        for file_ref in project_data['file_refs']:
-            if file_ref['path'].endswith(('.cpp', '.c', '.cc', '.cxx', '.h', '.hpp', '.cs')):
-                input_paths.append(f"\t\t\t\t\"$(SRCROOT)/{file_ref['path']}\",")
-        
-        lines.extend([
-            f"\t\t{uuids['build_phase_nutbuild']} /* NutBuild */ = {{",
-            "\t\t\tisa = PBXShellScriptBuildPhase;",
-            "\t\t\tbuildActionMask = 2147483647;",
-            "\t\t\tfiles = (",
-            "\t\t\t);",
-            "\t\t\tinputFileListPaths = (",
-            "\t\t\t);",
-            "\t\t\tinputPaths = (",
-        ])
-        
-        # 添加输入文件路径
-        lines.extend(input_paths)
-        
-        lines.extend([
-            "\t\t\t);",
-            "\t\t\tname = \"NutBuild\";",
-            "\t\t\toutputFileListPaths = (",
-            "\t\t\t);",
-            "\t\t\toutputPaths = (",
-            f"\t\t\t\t\"{output_file}\",",
-            "\t\t\t);",
-            "\t\t\trunOnlyForDeploymentPostprocessing = 0;",
-            "\t\t\tshellPath = /bin/bash;",
-            f"\t\t\tshellScript = \"{shell_script}\";",
-            "\t\t\tshowEnvVarsInLog = 1;",
-            "\t\t};"
-        ])
-        
+        shell_script = _GenerateXcodeNutBuildScript(project_data['project_name'])
+
+        # 根据项目类型确定输出文件（扩展名沿用上文查表结果）
+        output_file = f"$(SRCROOT)/../../Binary/{project_data['project_name']}{product_extension}"
+
+        w(f"\t\t{uuids['build_phase_nutbuild']} /* NutBuild */ = {{\n"
+          "\t\t\tisa = PBXShellScriptBuildPhase;\n"
+          "\t\t\tbuildActionMask = 2147483647;\n"
+          "\t\t\tfiles = (\n"
+          "\t\t\t);\n"
+          "\t\t\tinputFileListPaths = (\n"
+          "\t\t\t);\n"
+          "\t\t\tinputPaths = (\n")
+
+        # 添加输入文件路径（源文件和元数据文件，文件引用遍历时已收集）
+        w(''.join(input_paths_parts))
+
+        w("\t\t\t);\n"
+          "\t\t\tname = \"NutBuild\";\n"
+          "\t\t\toutputFileListPaths = (\n"
+          "\t\t\t);\n"
+          "\t\t\toutputPaths = (\n"
+          f"\t\t\t\t\"{output_file}\",\n"
+          "\t\t\t);\n"
+          "\t\t\trunOnlyForDeploymentPostprocessing = 0;\n"
+          "\t\t\tshellPath = /bin/bash;\n"
+          f"\t\t\tshellScript = \"{shell_script}\";\n"
+          "\t\t\tshowEnvVarsInLog = 1;\n"
+          "\t\t};\n")
+
         # 添加 Sources Build Phase（用于 IntelliSense，配置为不执行实际编译）
-        lines.extend([
-            f"\t\t{uuids['build_phase_sources']} /* Sources */ = {{",
-            "\t\t\tisa = PBXSourcesBuildPhase;",
-            "\t\t\tbuildActionMask = 0;",  # 设置为 0 禁用实际构建
-            "\t\t\tfiles = ("
-        ])
-        
-        for build_file in project_data['build_files']:
-            lines.append(f"\t\t\t\t{build_file['uuid']} /* {build_file['file_name']} in Sources */,")
-        
-        lines.extend([
-            "\t\t\t);",
-            "\t\t\trunOnlyForDeploymentPostprocessing = 1;",  # 设置为 1 跳过构建
-            "\t\t};"
-        ])
-        
-        # 添加构建配置
-        self._AddBuildConfigurations(lines, uuids, project_data['project_name'])
-        
+        w(f"\t\t{uuids['build_phase_sources']} /* Sources */ = {{\n"
+          "\t\t\tisa = PBXSourcesBuildPhase;\n"
+          "\t\t\tbuildActionMask = 0;\n"  # 设置为 0 禁用实际构建
+          "\t\t\tfiles = (\n")
+
+        # 条目在构建文件遍历时已收集
+        w(''.join(sources_phase_parts))
+
+        w("\t\t\t);\n"
+          "\t\t\trunOnlyForDeploymentPostprocessing = 1;\n"  # 设置为 1 跳过构建
+          "\t\t};\n")
+
+        # 添加构建配置（每块一次 format 填入 UUID；
+        # 原辅助函数只剩模板写出，唯一调用点就地展开）
+        w(_CFG_DEBUG_PROJECT_TMPL.format_map(uuids))
+        w(_CFG_RELEASE_PROJECT_TMPL.format_map(uuids))
+        w(_CFG_TARGET_TMPL.format(uuid=uuids['config_debug_target'], name='Debug'))
+        w(_CFG_TARGET_TMPL.format(uuid=uuids['config_release_target'], name='Release'))
+
         # 添加配置列表
-        self._AddConfigurationLists(lines, uuids)
-        
-        # 文件尾
-        lines.extend([
-            "\t};",
-            f"\trootObject = {uuids['project']};",
-            "}"
-        ])
-        
-        return '\n'.join(lines)
-    
-    def _GenerateXcodeNutBuildScript(self, project_name: str) -> str:
-        """生成优化的 Xcode NutBuild 脚本，提供更好的输出显示"""
-        script_lines = [
-            "#!/bin/bash",
-            "set -e  # Exit on error",
-            "",
-            "# === NutBuild for Xcode ===",
-            "echo \"🔨 Building project: {}\"".format(project_name),
-            "echo \"📁 Xcode SRCROOT: $SRCROOT\"",
-            "echo \"⚙️  Configuration: $CONFIGURATION\"",
-            "echo \"🖥️  Platform: $PLATFORM_NAME\"",
-            "echo \"\"",
-            "",
-            "# Find project root (contains CLAUDE.md)",
-            "PROJECT_ROOT=\"$SRCROOT\"",
-            "while [ ! -f \"$PROJECT_ROOT/CLAUDE.md\" ] && [ \"$PROJECT_ROOT\" != \"/\" ]; do",
-            "    PROJECT_ROOT=\"$(dirname \"$PROJECT_ROOT\")\"",
-            "done",
-            "",
-            "if [ ! -f \"$PROJECT_ROOT/CLAUDE.md\" ]; then",
-            "    echo \"❌ Error: Could not find project root (CLAUDE.md not found)\"",
-            "    exit 1",
-            "fi",
-            "",
-            "echo \"✅ Found project root: $PROJECT_ROOT\"",
-            "cd \"$PROJECT_ROOT\"",
-            "echo \"\"",
-            "",
-            "# Setup NutBuildTools",
-            "NUTBUILD_BINARY=\"$PROJECT_ROOT/Binary/NutBuildTools/NutBuildTools\"",
-            "",
-            "if [ ! -f \"$NUTBUILD_BINARY\" ]; then",
-            "    echo \"📦 NutBuildTools binary not found, building...\"",
-            "    echo \"\"",
-            "    ",
-            "    # Find dotnet",
-            "    DOTNET_PATH=\"\"",
-            "    if [ -f \"/usr/local/share/dotnet/dotnet\" ]; then",
-            "        DOTNET_PATH=\"/usr/local/share/dotnet/dotnet\"",
-            "    elif [ -f \"/opt/homebrew/bin/dotnet\" ]; then",
-            "        DOTNET_PATH=\"/opt/homebrew/bin/dotnet\"",
-            "    elif command -v dotnet >/dev/null 2>&1; then",
-            "        DOTNET_PATH=\"dotnet\"",
-            "    else",
-            "        echo \"❌ Error: dotnet not found\"",
-            "        echo \"💡 Please install .NET SDK from https://dotnet.microsoft.com/download\"", 
-            "        exit 1",
-            "    fi",
-            "    ",
-            "    echo \"🔧 Using dotnet at: $DOTNET_PATH\"",
-            "    echo \"📦 Building NutBuildTools...\"",
-            "    echo \"\"",
-            "    ",
-            "    # Build with output",
-            "    \"$DOTNET_PATH\" publish Source/Programs/NutBuildTools -c Release -o Binary/NutBuildTools",
-            "    ",
-            "    if [ ! -f \"$NUTBUILD_BINARY\" ]; then",
-            "        echo \"❌ Error: Failed to build NutBuildTools\"",
-            "        exit 1",
-            "    fi",
-            "    echo \"\"",
-            "    echo \"✅ NutBuildTools built successfully\"",
-            "else",
-            "    echo \"✅ NutBuildTools binary found\"",
-            "fi",
-            "",
-            "echo \"\"",
-            "echo \"🚀 Starting compilation with NutBuildTools...\"",
-            "echo \"\"",
-            "",
-            "# Run NutBuildTools with Mac platform (Darwin internal name)",
-            "\"$NUTBUILD_BINARY\" --target {} --platform Darwin --configuration \"$CONFIGURATION\"".format(project_name),
-            "",
-            "BUILD_RESULT=$?",
-            "echo \"\"",
-            "if [ $BUILD_RESULT -eq 0 ]; then",
-            "    echo \"✅ Build completed successfully!\"",
-            "else",
-            "    echo \"❌ Build failed with exit code $BUILD_RESULT\"",
-            "    exit $BUILD_RESULT",
-            "fi"
-        ]
-        
-        # Join lines and escape properly for pbxproj format
-        script_content = "\\n".join(script_lines)
-        # Escape quotes and backslashes for pbxproj format
-        script_content = script_content.replace("\\", "\\\\").replace("\"", "\\\"")
-        return script_content
-    
-    def _AddBuildConfigurations(self, lines: List[str], uuids: Dict[str, str], project_name: str):
-        """添加构建配置"""
-        # 项目级配置 - Debug
-        lines.extend([
-            f"\t\t{uuids['config_debug_project']} /* Debug */ = {{",
-            "\t\t\tisa = XCBuildConfiguration;",
-            "\t\t\tbuildSettings = {",
-            "\t\t\t\tALWAYS_SEARCH_USER_PATHS = NO;",
-            "\t\t\t\tCLANG_ANALYZER_NONNULL = YES;",
-            "\t\t\t\tCLANG_CXX_LANGUAGE_STANDARD = \"gnu++20\";",
-            "\t\t\t\tCLANG_ENABLE_MODULES = YES;",
-            "\t\t\t\tCLANG_WARN_BOOL_CONVERSION = YES;",
-            "\t\t\t\tCLANG_WARN_CONSTANT_CONVERSION = YES;",
-            "\t\t\t\tCLANG_WARN_EMPTY_BODY = YES;",
-            "\t\t\t\tCLANG_WARN_ENUM_CONVERSION = YES;",
-            "\t\t\t\tCLANG_WARN_INT_CONVERSION = YES;",
-            "\t\t\t\tCLANG_WARN_UNREACHABLE_CODE = YES;",
-            "\t\t\t\tCOPY_PHASE_STRIP = NO;",
-            "\t\t\t\tDEBUG_INFORMATION_FORMAT = dwarf;",
-            "\t\t\t\tENABLE_STRICT_OBJC_MSGSEND = YES;",
-            "\t\t\t\tENABLE_TESTABILITY = YES;",
-            "\t\t\t\tGCC_C_LANGUAGE_STANDARD = gnu11;",
-            "\t\t\t\tGCC_DYNAMIC_NO_PIC = NO;",
-            "\t\t\t\tGCC_NO_COMMON_BLOCKS = YES;",
-            "\t\t\t\tGCC_OPTIMIZATION_LEVEL = 0;",
-            "\t\t\t\tGCC_PREPROCESSOR_DEFINITIONS = (",
-            "\t\t\t\t\t\"DEBUG=1\",",
-            "\t\t\t\t\t\"$(inherited)\",",
-            "\t\t\t\t);",
-            "\t\t\t\tMACOSX_DEPLOYMENT_TARGET = 10.15;",
-            "\t\t\t\tONLY_ACTIVE_ARCH = YES;",
-            "\t\t\t\tSDKROOT = macosx;",
-            "\t\t\t};",
-            "\t\t\tname = Debug;",
-            "\t\t};",
-        ])
-        
-        # 项目级配置 - Release
-        lines.extend([
-            f"\t\t{uuids['config_release_project']} /* Release */ = {{",
-            "\t\t\tisa = XCBuildConfiguration;",
-            "\t\t\tbuildSettings = {",
-            "\t\t\t\tALWAYS_SEARCH_USER_PATHS = NO;",
-            "\t\t\t\tCLANG_ANALYZER_NONNULL = YES;",
-            "\t\t\t\tCLANG_CXX_LANGUAGE_STANDARD = \"gnu++20\";",
-            "\t\t\t\tCLANG_ENABLE_MODULES = YES;",
-            "\t\t\t\tCLANG_WARN_BOOL_CONVERSION = YES;",
-            "\t\t\t\tCLANG_WARN_CONSTANT_CONVERSION = YES;",
-            "\t\t\t\tCLANG_WARN_EMPTY_BODY = YES;",
-            "\t\t\t\tCLANG_WARN_ENUM_CONVERSION = YES;",
-            "\t\t\t\tCLANG_WARN_INT_CONVERSION = YES;",
-            "\t\t\t\tCLANG_WARN_UNREACHABLE_CODE = YES;",
-            "\t\t\t\tCOPY_PHASE_STRIP = NO;",
-            "\t\t\t\tDEBUG_INFORMATION_FORMAT = \"dwarf-with-dsym\";",
-            "\t\t\t\tENABLE_NS_ASSERTIONS = NO;",
-            "\t\t\t\tENABLE_STRICT_OBJC_MSGSEND = YES;",
-            "\t\t\t\tGCC_C_LANGUAGE_STANDARD = gnu11;",
-            "\t\t\t\tGCC_NO_COMMON_BLOCKS = YES;",
-            "\t\t\t\tMACOSX_DEPLOYMENT_TARGET = 10.15;",
-            "\t\t\t\tSDKROOT = macosx;",
-            "\t\t\t};",
-            "\t\t\tname = Release;",
-            "\t\t};"
-        ])
-        
-        # Target 级配置 - Debug
-        lines.extend([
-            f"\t\t{uuids['config_debug_target']} /* Debug */ = {{",
-            "\t\t\tisa = XCBuildConfiguration;",
-            "\t\t\tbuildSettings = {",
-            "\t\t\t\tPRODUCT_NAME = \"$(TARGET_NAME)\";",
-            "\t\t\t\t// 搜索路径配置",
-            "\t\t\t\tUSER_HEADER_SEARCH_PATHS = \"$(SRCROOT)/../../Source/**\";",
-            "\t\t\t\tHEADER_SEARCH_PATHS = \"$(SRCROOT)/../../ThirdParty/**\";",
-            "\t\t\t\t// C++ 语言标准",
-            "\t\t\t\tCLANG_CXX_LANGUAGE_STANDARD = \"gnu++20\";",
-            "\t\t\t\tCLANG_CXX_LIBRARY = \"libc++\";",
-            "\t\t\t\t// 启用代码分析但跳过实际编译",
-            "\t\t\t\tSKIP_INSTALL = YES;",
-            "\t\t\t\tCODE_SIGN_IDENTITY = \"\";",
-            "\t\t\t\t// 禁用原生构建但保留 IntelliSense",
-            "\t\t\t\tBUILD_ACTIVE_ARCHITECTURE_ONLY = NO;",
-            "\t\t\t\tCOMPILE_SOURCES_BUILD_PHASE_ENABLED = NO;",
-            "\t\t\t\tRUN_ONLY_FOR_DEPLOYMENT_POSTPROCESSING = YES;",
-            "\t\t\t\t// 强制禁用编译器调用",
-            "\t\t\t\tGCC_PREPROCESSOR_DEFINITIONS = (",
-            "\t\t\t\t\t\"XCODE_INTELLISENSE_ONLY=1\",",
-            "\t\t\t\t\t\"$(inherited)\",",
-            "\t\t\t\t);",
-            "\t\t\t\tOTHER_CFLAGS = \"-fsyntax-only\";",
-            "\t\t\t\t// IntelliSense 相关设置",
-            "\t\t\t\tCLANG_ANALYZER_NONNULL = YES;",
-            "\t\t\t\tCLANG_WARN_BOOL_CONVERSION = YES;",
-            "\t\t\t\tCLANG_WARN_CONSTANT_CONVERSION = YES;",
-            "\t\t\t\tCLANG_WARN_EMPTY_BODY = YES;",
-            "\t\t\t\tCLANG_WARN_ENUM_CONVERSION = YES;",
-            "\t\t\t\tCLANG_WARN_INT_CONVERSION = YES;",
-            "\t\t\t\tCLANG_WARN_UNREACHABLE_CODE = YES;",
-            "\t\t\t\tGCC_WARN_ABOUT_RETURN_TYPE = YES_ERROR;",
-            "\t\t\t\tGCC_WARN_UNDECLARED_SELECTOR = YES;",
-            "\t\t\t\tGCC_WARN_UNINITIALIZED_AUTOS = YES_AGGRESSIVE;",
-            "\t\t\t\tGCC_WARN_UNUSED_FUNCTION = YES;",
-            "\t\t\t\tGCC_WARN_UNUSED_VARIABLE = YES;",
-            "\t\t\t};",
-            "\t\t\tname = Debug;",
-            "\t\t};",
-        ])
-        
-        # Target 级配置 - Release
-        lines.extend([
-            f"\t\t{uuids['config_release_target']} /* Release */ = {{",
-            "\t\t\tisa = XCBuildConfiguration;",
-            "\t\t\tbuildSettings = {",
-            "\t\t\t\tPRODUCT_NAME = \"$(TARGET_NAME)\";",
-            "\t\t\t\t// 搜索路径配置",
-            "\t\t\t\tUSER_HEADER_SEARCH_PATHS = \"$(SRCROOT)/../../Source/**\";",
-            "\t\t\t\tHEADER_SEARCH_PATHS = \"$(SRCROOT)/../../ThirdParty/**\";",
-            "\t\t\t\t// C++ 语言标准",
-            "\t\t\t\tCLANG_CXX_LANGUAGE_STANDARD = \"gnu++20\";",
-            "\t\t\t\tCLANG_CXX_LIBRARY = \"libc++\";",
-            "\t\t\t\t// 启用代码分析但跳过实际编译",
-            "\t\t\t\tSKIP_INSTALL = YES;",
-            "\t\t\t\tCODE_SIGN_IDENTITY = \"\";",
-            "\t\t\t\t// 禁用原生构建但保留 IntelliSense",
-            "\t\t\t\tBUILD_ACTIVE_ARCHITECTURE_ONLY = NO;",
-            "\t\t\t\tCOMPILE_SOURCES_BUILD_PHASE_ENABLED = NO;",
-            "\t\t\t\tRUN_ONLY_FOR_DEPLOYMENT_POSTPROCESSING = YES;",
-            "\t\t\t\t// 强制禁用编译器调用",
-            "\t\t\t\tGCC_PREPROCESSOR_DEFINITIONS = (",
-            "\t\t\t\t\t\"XCODE_INTELLISENSE_ONLY=1\",",
-            "\t\t\t\t\t\"$(inherited)\",",
-            "\t\t\t\t);",
-            "\t\t\t\tOTHER_CFLAGS = \"-fsyntax-only\";",
-            "\t\t\t\t// IntelliSense 相关设置",
-            "\t\t\t\tCLANG_ANALYZER_NONNULL = YES;",
-            "\t\t\t\tCLANG_WARN_BOOL_CONVERSION = YES;",
-            "\t\t\t\tCLANG_WARN_CONSTANT_CONVERSION = YES;",
-            "\t\t\t\tCLANG_WARN_EMPTY_BODY = YES;",
-            "\t\t\t\tCLANG_WARN_ENUM_CONVERSION = YES;",
-            "\t\t\t\tCLANG_WARN_INT_CONVERSION = YES;",
-            "\t\t\t\tCLANG_WARN_UNREACHABLE_CODE = YES;",
-            "\t\t\t\tGCC_WARN_ABOUT_RETURN_TYPE = YES_ERROR;",
-            "\t\t\t\tGCC_WARN_UNDECLARED_SELECTOR = YES;",
-            "\t\t\t\tGCC_WARN_UNINITIALIZED_AUTOS = YES_AGGRESSIVE;",
-            "\t\t\t\tGCC_WARN_UNUSED_FUNCTION = YES;",
-            "\t\t\t\tGCC_WARN_UNUSED_VARIABLE = YES;",
-            "\t\t\t};",
-            "\t\t\tname = Release;",
-            "\t\t};"
-        ])
-    
-    def _AddConfigurationLists(self, lines: List[str], uuids: Dict[str, str]):
-        """添加配置列表"""
-        lines.extend([
-            f"\t\t{uuids['config_list_project']} /* Build configuration list for PBXProject */ = {{",
-            "\t\t\tisa = XCConfigurationList;",
-            "\t\t\tbuildConfigurations = (",
-            f"\t\t\t\t{uuids['config_debug_project']},",
-            f"\t\t\t\t{uuids['config_release_project']},",
-            "\t\t\t);",
-            "\t\t\tdefaultConfigurationIsVisible = 0;",
-            "\t\t\tdefaultConfigurationName = Release;",
-            "\t\t};",
-            f"\t\t{uuids['config_list_target']} /* Build configuration list for PBXNativeTarget */ = {{",
-            "\t\t\tisa = XCConfigurationList;",
-            "\t\t\tbuildConfigurations = (",
-            f"\t\t\t\t{uuids['config_debug_target']},",
-            f"\t\t\t\t{uuids['config_release_target']},",
-            "\t\t\t);",
-            "\t\t\tdefaultConfigurationIsVisible = 0;",
-            "\t\t\tdefaultConfigurationName = Release;",
-            "\t\t};"
-        ])
\ No newline at end of file
+        w(_CONFIG_LISTS_TMPL.format_map(uuids))
+
+        # 文件尾（最后一行不带换行，保持输出与 join 版本一致）
+        w("\t};\n"
+          f"\trootObject = {uuids['project']};\n"
+          "}")
+
+        return buf.getvalue()